@@ -0,0 +1,222 @@
+import os
+import time
+import numpy as np
+
+from utils.hand_codec import (HAND_TYPES, TYPE_FIELD, FINGERS_FIELD, encode_fingers, decode_fingers,
+                              write_header, read_header)
+
+# Compact dataset (utils.hand_codec record file), samples appended as they are captured
+DATASET_MAGIC = b"VHFD"
+DATASET_VERSION = 1
+SAMPLE_DTYPE = np.dtype([
+    ("landmarks", np.float32, (21, 3)),  # Pixel x, y and z (z scaled to pixels by frame width)
+    TYPE_FIELD,
+    FINGERS_FIELD
+])
+LEFT = HAND_TYPES.index("Left")
+
+def hands_to_array(hands, width):
+    """
+    Hand dicts -> (landmarks[n, 21, 3] float32, is_left[n] bool).
+    Uses the unsmoothed landmarks where smoothing replaced them: the model is trained
+    on raw detections (record() runs without smoothing), and smoothed points carry no z.
+    """
+    lms = np.array([hand.get('unsmoothed_landmarks', hand['landmarks']) for hand in hands],
+                   dtype=np.float32).reshape(len(hands), 21, 3)
+    lms[:, :, 2] *= width
+    is_left = np.array([hand['type'] == "Left" for hand in hands], dtype=bool)
+    return lms, is_left
+
+def normalize(lms, is_left):
+    """
+    Batch pose normalization: wrist at the origin, wrist -> middle root pointing up
+    with unit length, left hands mirrored onto right ones. Removes position, size,
+    in-plane rotation and handedness, so the classifier only sees finger shape.
+    Returns features[n, 63].
+    """
+    pts = lms - lms[:, :1]
+    x, y = pts[:, :, 0], pts[:, :, 1]
+    inv = 1 / np.maximum(np.hypot(x[:, 9], y[:, 9]), 1e-6)
+    ux, uy = (x[:, 9] * inv)[:, None], (y[:, 9] * inv)[:, None]
+    mirror = np.where(is_left, -inv, inv)[:, None]
+    # Rotation taking the palm axis (u) to (0, -1), image y points down
+    feats = np.empty_like(pts)
+    feats[:, :, 0] = (ux * y - uy * x) * mirror
+    feats[:, :, 1] = -(ux * x + uy * y) * inv[:, None]
+    feats[:, :, 2] = pts[:, :, 2] * inv[:, None]
+    return feats.reshape(len(lms), -1).astype(np.float32)
+
+class FingerDataset:
+    """
+    Append-only labeled landmark store (one SAMPLE_DTYPE record per hand).
+    """
+    def __init__(self, path):
+        self.path = path
+        if not os.path.exists(path):
+            with open(path, "wb") as f:
+                write_header(f, DATASET_MAGIC, DATASET_VERSION)
+
+    def append(self, lms, is_left, fingers):
+        records = np.zeros(len(lms), dtype=SAMPLE_DTYPE)
+        records["landmarks"] = lms
+        records["type"] = np.where(is_left, LEFT, HAND_TYPES.index("Right"))
+        records["fingers"] = encode_fingers(np.asarray(fingers).reshape(-1, 5))
+        with open(self.path, "ab") as f:
+            f.write(records.tobytes())
+
+    def load(self):
+        """
+        Returns (landmarks[n, 21, 3], is_left[n], fingers[n, 5]).
+        """
+        with open(self.path, "rb") as f:
+            read_header(f, DATASET_MAGIC, "finger dataset")
+            records = np.fromfile(f, dtype=SAMPLE_DTYPE)
+        return records["landmarks"], records["type"] == LEFT, decode_fingers(records["fingers"])
+
+class FingerClassifier:
+    """
+    Small MLP (63 -> hidden -> 5 sigmoid) predicting which fingers are up.
+    All hands of a frame are classified together: one normalize pass and two matmuls.
+    """
+    def __init__(self, hidden=32, seed=0):
+        rng = np.random.default_rng(seed)
+        self.w1 = (rng.standard_normal((63, hidden)) * np.sqrt(2 / 63)).astype(np.float32)
+        self.b1 = np.zeros(hidden, dtype=np.float32)
+        self.w2 = (rng.standard_normal((hidden, 5)) * np.sqrt(1 / hidden)).astype(np.float32)
+        self.b2 = np.zeros(5, dtype=np.float32)
+
+    @property
+    def params(self):
+        return [self.w1, self.b1, self.w2, self.b2]
+
+    def logits(self, feats):
+        return np.maximum(feats @ self.w1 + self.b1, 0) @ self.w2 + self.b2
+
+    def predict(self, lms, is_left):
+        """
+        Finger vectors uint8[n, 5] for a batch of hands.
+        """
+        return (self.logits(normalize(lms, is_left)) > 0).astype(np.uint8)
+
+    def apply(self, hands, width):
+        """
+        Replaces hand['fingers'] of every hand in place (one batched call).
+        """
+        if not hands: return hands
+        for hand, fingers in zip(hands, self.predict(*hands_to_array(hands, width)).tolist()):
+            hand['fingers'] = fingers
+        return hands
+
+    def fit(self, lms, is_left, fingers, epochs=300, lr=0.01, batch_size=256, weight_decay=1e-4, noise=0.02, seed=0):
+        """
+        Adam on binary cross-entropy. Light coordinate jitter acts as augmentation.
+        """
+        rng = np.random.default_rng(seed)
+        feats = normalize(lms, is_left)
+        targets = fingers.astype(np.float32)
+        m = [np.zeros_like(p) for p in self.params]
+        v = [np.zeros_like(p) for p in self.params]
+        step = 0
+        for _ in range(epochs):
+            order = rng.permutation(len(feats))
+            for start in range(0, len(feats), batch_size):
+                idx = order[start:start + batch_size]
+                x = feats[idx] + rng.normal(0, noise, (len(idx), feats.shape[1])).astype(np.float32)
+                y = targets[idx]
+
+                # Forward
+                pre = x @ self.w1 + self.b1
+                h = np.maximum(pre, 0)
+                p = 1 / (1 + np.exp(-(h @ self.w2 + self.b2)))
+
+                # Backward
+                d_out = (p - y) / len(idx)
+                d_h = (d_out @ self.w2.T) * (pre > 0)
+                grads = [x.T @ d_h + weight_decay * self.w1, d_h.sum(0),
+                         h.T @ d_out + weight_decay * self.w2, d_out.sum(0)]
+
+                step += 1
+                for param, grad, mi, vi in zip(self.params, grads, m, v):
+                    mi[:] = 0.9 * mi + 0.1 * grad
+                    vi[:] = 0.999 * vi + 0.001 * grad * grad
+                    param -= lr * (mi / (1 - 0.9 ** step)) / (np.sqrt(vi / (1 - 0.999 ** step)) + 1e-8)
+        return self
+
+    def accuracy(self, lms, is_left, fingers):
+        """
+        (per-finger accuracy[5], exact-vector accuracy).
+        """
+        pred = self.predict(lms, is_left)
+        return (pred == fingers).mean(axis=0), float(np.all(pred == fingers, axis=1).mean())
+
+    def save(self, path):
+        np.savez(path, w1=self.w1, b1=self.b1, w2=self.w2, b2=self.b2)
+
+    @classmethod
+    def load(cls, path):
+        data = np.load(path)
+        model = cls(hidden=data["w1"].shape[1])
+        model.w1, model.b1, model.w2, model.b2 = (data[k].astype(np.float32) for k in ("w1", "b1", "w2", "b2"))
+        return model
+
+def record(dataset_path, label, seconds=10.0, camera=0):
+    """
+    Captures labeled samples: hold the pose given by `label` (e.g. "01100") in view.
+    """
+    import cv2
+    from engine.vision_engine import VisionEngine
+    fingers = [int(c) for c in label]
+    dataset = FingerDataset(dataset_path)
+    vision = VisionEngine()
+    cap = cv2.VideoCapture(camera)
+    count = 0
+    start = time.time()
+    while time.time() - start < seconds:
+        success, frame = cap.read()
+        if not success: continue
+        frame = cv2.flip(frame, 1)
+        hands = vision.process_frame(frame)
+        if not hands: continue
+        lms, is_left = hands_to_array(hands, frame.shape[1])
+        dataset.append(lms, is_left, [fingers] * len(hands))
+        count += len(hands)
+    cap.release()
+    vision.close()
+    print(f"FingerDataset: recorded {count} samples of {label} to {dataset_path}")
+
+def train(dataset_path, model_path="finger_model.npz", holdout=0.2, seed=0):
+    lms, is_left, fingers = FingerDataset(dataset_path).load()
+    order = np.random.default_rng(seed).permutation(len(lms))
+    split = int(len(order) * (1 - holdout))
+    train_idx, test_idx = order[:split], order[split:]
+    model = FingerClassifier().fit(lms[train_idx], is_left[train_idx], fingers[train_idx])
+    per_finger, exact = model.accuracy(lms[test_idx], is_left[test_idx], fingers[test_idx])
+    print(f"FingerClassifier: {len(train_idx)} train / {len(test_idx)} held out, "
+          f"per finger {np.round(per_finger, 3).tolist()}, full vector {exact:.3f}")
+    model.save(model_path)
+    print(f"FingerClassifier: saved {model_path}")
+    return model
+
+def benchmark(model, hands=2, iterations=10000):
+    lms = np.random.default_rng(0).normal(300, 50, (hands, 21, 3)).astype(np.float32)
+    is_left = np.arange(hands) % 2 == 0
+    start = time.perf_counter()
+    for _ in range(iterations):
+        model.predict(lms, is_left)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+if __name__ == "__main__":
+    # python -m engine.finger_classifier record dataset.bin 01100 [seconds]
+    # python -m engine.finger_classifier train dataset.bin [finger_model.npz]
+    # python -m engine.finger_classifier bench [finger_model.npz]
+    import sys
+    cmd, args = (sys.argv[1], sys.argv[2:]) if len(sys.argv) > 1 else ("", [])
+    if cmd == "record":
+        record(args[0], args[1], float(args[2]) if len(args) > 2 else 10.0)
+    elif cmd == "train":
+        train(args[0], args[1] if len(args) > 1 else "finger_model.npz")
+    elif cmd == "bench":
+        model = FingerClassifier.load(args[0]) if args else FingerClassifier()
+        print(f"FingerClassifier: {benchmark(model):.1f} us per frame (2 hands)")
+    else:
+        print("usage: python -m engine.finger_classifier record | train | bench")
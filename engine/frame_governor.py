@@ -0,0 +1,77 @@
+import time
+
+# Ordered from best quality (0) to cheapest. Each step sheds one cost.
+QUALITY_LEVELS = [
+    {"name": "ultra",    "inference_scale": 1.0,  "inference_interval": 1, "smoothing": True,  "landmarks": True,  "smooth_scaling": True,  "audience_interval": 1},
+    {"name": "high",     "inference_scale": 1.0,  "inference_interval": 1, "smoothing": True,  "landmarks": True,  "smooth_scaling": False, "audience_interval": 1},
+    {"name": "balanced", "inference_scale": 0.75, "inference_interval": 1, "smoothing": True,  "landmarks": True,  "smooth_scaling": False, "audience_interval": 2},
+    {"name": "fast",     "inference_scale": 0.5,  "inference_interval": 1, "smoothing": True,  "landmarks": False, "smooth_scaling": False, "audience_interval": 2},
+    {"name": "low",      "inference_scale": 0.5,  "inference_interval": 2, "smoothing": False, "landmarks": False, "smooth_scaling": False, "audience_interval": 3},
+    {"name": "minimal",  "inference_scale": 0.35, "inference_interval": 3, "smoothing": False, "landmarks": False, "smooth_scaling": False, "audience_interval": 4}
+]
+
+class FrameGovernor:
+    """
+    Steps through QUALITY_LEVELS so that frame time settles under a budget.
+    Hysteresis: degrading needs a sustained overrun, upgrading needs sustained
+    headroom (and takes longer), and every change is followed by a cooldown.
+    """
+    def __init__(self, budget_ms=33.0, start_level=0, alpha=0.1,
+                 degrade_ratio=1.05, upgrade_ratio=0.65,
+                 degrade_frames=15, upgrade_frames=90, cooldown=1.0):
+        self.budget_ms = budget_ms
+        self.level = start_level
+        self.alpha = alpha
+        self.degrade_ratio = degrade_ratio
+        self.upgrade_ratio = upgrade_ratio
+        self.degrade_frames = degrade_frames
+        self.upgrade_frames = upgrade_frames
+        self.cooldown = cooldown
+
+        self.avg_ms = None
+        self.over_count = 0
+        self.under_count = 0
+        self.last_change = 0
+        self.frame_idx = 0
+
+    @property
+    def settings(self):
+        return QUALITY_LEVELS[self.level]
+
+    def update(self, frame_ms):
+        """
+        Feeds one frame time. Returns True if the quality level changed.
+        """
+        self.frame_idx += 1
+        self.avg_ms = frame_ms if self.avg_ms is None else self.alpha * frame_ms + (1 - self.alpha) * self.avg_ms
+
+        if self.avg_ms > self.budget_ms * self.degrade_ratio:
+            self.over_count += 1
+            self.under_count = 0
+        elif self.avg_ms < self.budget_ms * self.upgrade_ratio:
+            self.under_count += 1
+            self.over_count = 0
+        else:
+            self.over_count = self.under_count = 0
+
+        now = time.time()
+        if now - self.last_change < self.cooldown: return False
+
+        if self.over_count >= self.degrade_frames and self.level < len(QUALITY_LEVELS) - 1:
+            return self._set_level(self.level + 1, now)
+        if self.under_count >= self.upgrade_frames and self.level > 0:
+            return self._set_level(self.level - 1, now)
+        return False
+
+    def _set_level(self, level, now):
+        self.level = level
+        self.last_change = now
+        self.over_count = self.under_count = 0
+        print(f"FrameGovernor: {self.status()}")
+        # Let the average re-converge to the new level's cost
+        self.avg_ms = None
+        return True
+
+    def status(self):
+        avg = f"{self.avg_ms:.1f}" if self.avg_ms is not None else "--"
+        return f"level {self.level} ({self.settings['name']}) avg {avg} ms / budget {self.budget_ms:g} ms"
@@ -1,12 +1,15 @@
 import numpy as np
-import time
+
+TRIGGER_GESTURE = [1, 1, 1, 0, 0]
 
 class GestureEngine:
-    def __init__(self):
+    def __init__(self, history):
+        # Shared HandHistory: trigger timing is read from it, not tracked here
+        self.history = history
         self.menu_active = False
         self.menu_center = None
         self.selected_tool = None
-        self.trigger_start_time = None
+        self.trigger_hold = 0.4
         self.last_state = "IDLE"
         
         # Tool Map based on angles
@@ -20,9 +23,7 @@ class GestureEngine:
         if not hands:
             if self.menu_active:
                 self.menu_active = False
-                self._reset_trigger()
                 return "SELECTED" # Release on hand loss
-            self._reset_trigger()
             return "IDLE"
 
         hand = hands[0]
@@ -30,13 +31,11 @@ class GestureEngine:
         index_pos = hand['landmarks'][8][:2]
 
         # 1. Trigger Pulse logic
-        is_trigger_gesture = (fingers == [1, 1, 1, 0, 0])
+        is_trigger_gesture = (fingers == TRIGGER_GESTURE)
         
         if is_trigger_gesture:
             if not self.menu_active:
-                if self.trigger_start_time is None:
-                    self.trigger_start_time = time.time()
-                elif time.time() - self.trigger_start_time > 0.4:
+                if self.history.held_for(0, TRIGGER_GESTURE) > self.trigger_hold:
                     self.menu_active = True
                     self.menu_center = index_pos
                     return "MENU_OPENED"
@@ -52,15 +51,10 @@ class GestureEngine:
                 self.menu_active = False
                 selection = self._calculate_selection(index_pos, hand_scale=hand.get('scale'))
                 self.selected_tool = selection
-                self._reset_trigger()
                 return "SELECTED"
 
-        self._reset_trigger()
         return "IDLE"
 
-    def _reset_trigger(self):
-        self.trigger_start_time = None
-
     def _calculate_selection(self, current_pos, hand_scale=None):
         if self.menu_center is None: return None
         
@@ -0,0 +1,130 @@
+import time
+import numpy as np
+
+# Wrist, Thumb Tip, Index Tip, Middle Root, Middle Tip
+KEY_LANDMARKS = [0, 4, 8, 9, 12]
+
+class HandHistory:
+    """
+    Fixed-size circular buffer holding the last N frames of every tracked hand.
+    Velocity / acceleration of KEY_LANDMARKS and pinch metrics are computed once
+    per frame, vectorized across hands; tools read them as O(1) array slices.
+    Hand slots follow the order of VisionEngine results (slot 0 = hands[0]).
+    """
+    def __init__(self, capacity=128, max_hands=2):
+        self.capacity = capacity
+        self.max_hands = max_hands
+        self.key_index = {lm: i for i, lm in enumerate(KEY_LANDMARKS)}
+
+        # Ring storage (all hands share one write head)
+        self.landmarks = np.zeros((max_hands, capacity, 21, 3), dtype=np.float32)
+        self.fingers = np.zeros((max_hands, capacity, 5), dtype=np.uint8)
+        self.scale = np.ones((max_hands, capacity), dtype=np.float32)
+        self.pinch = np.zeros((max_hands, capacity, 4), dtype=np.float32) # raw, norm, cx, cy
+        self.timestamps = np.zeros(capacity)
+        self.count = np.zeros(max_hands, dtype=np.int64) # Consecutive frames each hand was seen
+        self.head = -1
+        self.frame_idx = -1
+
+        # Per-frame kinematics of KEY_LANDMARKS (px/s, px/s^2)
+        self.velocity = np.zeros((max_hands, len(KEY_LANDMARKS), 2), dtype=np.float32)
+        self.acceleration = np.zeros((max_hands, len(KEY_LANDMARKS), 2), dtype=np.float32)
+        self._last_hands = None
+        self.fresh = False # The last update() stored a new sample (False on a repeated one)
+
+    def update(self, hands, timestamp=None):
+        # VisionEngine hands back the same list when inference is skipped: not a new sample
+        if hands is self._last_hands and hands:
+            self.fresh = False
+            return
+        self._last_hands = hands
+        self.fresh = True
+
+        self.frame_idx += 1
+        self.head = (self.head + 1) % self.capacity
+        self.timestamps[self.head] = timestamp if timestamp is not None else time.time()
+
+        n = min(len(hands), self.max_hands)
+        self.count[n:] = 0
+        if n == 0: return
+
+        for slot in range(n):
+            hand = hands[slot]
+            self.landmarks[slot, self.head] = [(lm[0], lm[1], lm[2] if len(lm) > 2 else 0.0) for lm in hand['landmarks']]
+            self.fingers[slot, self.head] = hand['fingers']
+            self.scale[slot, self.head] = hand.get('scale') or 100
+        self.count[:n] += 1
+
+        # Vectorized per-frame metrics
+        rows = self.landmarks[:n, self.head]
+        p4, p8 = rows[:, 4, :2], rows[:, 8, :2]
+        raw = np.linalg.norm(p4 - p8, axis=1)
+        self.pinch[:n, self.head, 0] = raw
+        self.pinch[:n, self.head, 1] = raw / self.scale[:n, self.head]
+        self.pinch[:n, self.head, 2:] = (p4 + p8) / 2
+
+        prev, prev2 = (self.head - 1) % self.capacity, (self.head - 2) % self.capacity
+        dt = max(self.timestamps[self.head] - self.timestamps[prev], 1e-3)
+        dt_prev = max(self.timestamps[prev] - self.timestamps[prev2], 1e-3)
+        pos = rows[:, KEY_LANDMARKS, :2]
+        pos1 = self.landmarks[:n, prev][:, KEY_LANDMARKS, :2]
+        pos2 = self.landmarks[:n, prev2][:, KEY_LANDMARKS, :2]
+        vel = (pos - pos1) / dt
+        vel_prev = (pos1 - pos2) / dt_prev
+        acc = (vel - vel_prev) / dt
+
+        counts = self.count[:n, None, None]
+        self.velocity[:n] = np.where(counts >= 2, vel, 0)
+        self.acceleration[:n] = np.where(counts >= 3, acc, 0)
+        self.velocity[n:] = 0
+        self.acceleration[n:] = 0
+
+    def available(self, hand=0):
+        return int(min(self.count[hand], self.capacity))
+
+    def window(self, hand=0, n=None, landmark=None):
+        """
+        Last n samples, oldest first. Returns landmarks[n, 21, 3] or [n, 3] for one landmark.
+        """
+        n = self.available(hand) if n is None else min(n, self.available(hand))
+        idx = (self.head - np.arange(n - 1, -1, -1)) % self.capacity
+        rows = self.landmarks[hand, idx]
+        return rows if landmark is None else rows[:, landmark]
+
+    def displacement(self, hand=0, landmark=9, frames=1):
+        """
+        Position change of a landmark over the last `frames` frames (clipped to what is stored).
+        """
+        frames = min(frames, self.available(hand) - 1)
+        if frames <= 0: return np.zeros(2, dtype=np.float32)
+        then = (self.head - frames) % self.capacity
+        return self.landmarks[hand, self.head, landmark, :2] - self.landmarks[hand, then, landmark, :2]
+
+    def kinematics(self, hand=0, landmark=8):
+        """
+        (velocity, acceleration) of a KEY_LANDMARKS entry for the current frame.
+        """
+        k = self.key_index[landmark]
+        return self.velocity[hand, k], self.acceleration[hand, k]
+
+    def pinch_delta(self, hand=0):
+        """
+        Frame-to-frame change of (raw distance, normalized distance, center[2]).
+        Zero on a repeated sample, so callers that accumulate it don't apply a step twice.
+        """
+        if not self.fresh or self.available(hand) < 2:
+            return 0.0, 0.0, np.zeros(2, dtype=np.float32)
+        d = self.pinch[hand, self.head] - self.pinch[hand, (self.head - 1) % self.capacity]
+        return float(d[0]), float(d[1]), d[2:]
+
+    def held_for(self, hand, pattern):
+        """
+        Seconds the finger pattern has been held continuously (0 if not held now).
+        """
+        n = self.available(hand)
+        if n == 0: return 0.0
+        idx = (self.head - np.arange(n)) % self.capacity # Newest first
+        matches = np.all(self.fingers[hand, idx] == pattern, axis=1)
+        if not matches[0]: return 0.0
+        run = n if matches.all() else int(np.argmin(matches))
+        return float(self.timestamps[self.head] - self.timestamps[idx[run - 1]])
@@ -0,0 +1,182 @@
+import os
+import time
+import multiprocessing
+import numpy as np
+
+from utils.shm_ring import SharedFrameWriter, SharedFrameReader
+from utils.hand_codec import encode_type
+
+def _worker_main(conn, shm_name, model_path, use_gpu, profiles):
+    """
+    Child process entry point: owns one HandLandmarker per profile and answers frame requests.
+    Frames arrive through shared memory, results leave as compact float32 arrays.
+    """
+    import cv2
+    import mediapipe as mp
+    from engine.vision_engine import create_hand_landmarker, INFERENCE_PROFILES
+
+    try:
+        detectors = {name: create_hand_landmarker(model_path, use_gpu=use_gpu, **INFERENCE_PROFILES[name])
+                     for name in profiles}
+        reader = SharedFrameReader(shm_name, track=True) # Spawned: shares the parent's resource tracker
+    except Exception as e:
+        conn.send(("error", 0, str(e)))
+        return
+    conn.send(("ready", 0, None))
+
+    while True:
+        try:
+            msg = conn.recv()
+        except (EOFError, OSError):
+            break
+        if msg is None: break
+
+        seq, timestamp, profile = msg
+        detector = detectors.get(profile) or detectors[profiles[0]]
+        meta, frame = reader.read_latest()
+        if meta is None or meta.seq != seq:
+            conn.send(("skip", seq, None))
+            continue
+
+        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        del frame
+        result = detector.detect_for_video(mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb), timestamp)
+
+        n = len(result.hand_landmarks)
+        lms = np.empty((n, 21, 3), dtype=np.float32)
+        types = np.empty(n, dtype=np.uint8)
+        for i, (landmarks, handedness) in enumerate(zip(result.hand_landmarks, result.handedness)):
+            lms[i] = [(lm.x, lm.y, lm.z) for lm in landmarks]
+            types[i] = encode_type(handedness[0].category_name)
+        conn.send(("result", seq, (lms, types)))
+
+    reader.close()
+
+class InferenceWorker:
+    """
+    Runs hand inference in a dedicated child process.
+    Submission never blocks: one frame is in flight at a time and the newest
+    completed result is returned. The worker is restarted if it dies or hangs.
+    """
+    def __init__(self, model_path="hand_landmarker.task", use_gpu=False, profiles=("full",),
+                 shape=(720, 1280, 3), hang_timeout=2.0, startup_timeout=30.0):
+        self.model_path = model_path
+        self.use_gpu = use_gpu
+        self.profiles = tuple(profiles) # Names from engine.vision_engine.INFERENCE_PROFILES
+        self.hang_timeout = hang_timeout
+        self.startup_timeout = startup_timeout
+
+        # Spawn keeps Qt / MediaPipe state out of the child
+        self.ctx = multiprocessing.get_context("spawn")
+        self.ring = SharedFrameWriter(f"visionhand_infer_{os.getpid()}_{id(self)}", shape=shape, num_slots=2)
+
+        self.process = None
+        self.conn = None
+        self.latest = None
+        self.latency_ms = 0.0
+        self.completed = 0
+        self.restarts = 0
+        self.restart_backoff = 0.5
+        self.next_restart_time = 0
+        self._start()
+
+    def _start(self):
+        parent_conn, child_conn = self.ctx.Pipe()
+        self.process = self.ctx.Process(target=_worker_main,
+                                        args=(child_conn, self.ring.name, self.model_path,
+                                              self.use_gpu, self.profiles),
+                                        daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.conn = parent_conn
+        self.ready = False
+        self.in_flight = None # (seq, send_time)
+        self.started_at = time.time()
+
+    def _restart(self, reason):
+        print(f"InferenceWorker: {reason}, restarting (#{self.restarts + 1})")
+        self._kill()
+        self.latest = None # Never report stale hands from a dead worker
+        self.restarts += 1
+        # Exponential backoff so a broken model cannot spin the CPU
+        self.next_restart_time = time.time() + self.restart_backoff
+        self.restart_backoff = min(self.restart_backoff * 2, 10.0)
+
+    def _kill(self):
+        if self.process is not None and self.process.is_alive():
+            self.process.terminate()
+            self.process.join(timeout=1.0)
+        if self.conn is not None:
+            self.conn.close()
+        self.process = None
+        self.conn = None
+
+    def poll(self):
+        """
+        Drains finished results and checks worker health. Never blocks.
+        """
+        if self.process is None:
+            if time.time() >= self.next_restart_time: self._start()
+            return
+
+        try:
+            while self.conn.poll():
+                kind, seq, payload = self.conn.recv()
+                if kind == "ready":
+                    self.ready = True
+                elif kind == "result":
+                    self.latest = payload
+                    self.completed += 1
+                    self.latency_ms = (time.time() - self.in_flight[1]) * 1000 if self.in_flight else 0.0
+                    self.in_flight = None
+                    self.restart_backoff = 0.5
+                elif kind == "skip":
+                    self.in_flight = None
+                elif kind == "error":
+                    print(f"InferenceWorker: model error: {payload}")
+        except (EOFError, OSError):
+            self._restart("pipe closed")
+            return
+
+        now = time.time()
+        if not self.process.is_alive():
+            self._restart(f"worker exited with code {self.process.exitcode}")
+        elif self.in_flight and now - self.in_flight[1] > self.hang_timeout:
+            self._restart("worker hung")
+        elif not self.ready and now - self.started_at > self.startup_timeout:
+            self._restart("worker failed to start")
+
+    def submit(self, frame, timestamp, profile="full"):
+        """
+        Hands a frame to the worker if it is idle. Returns True if submitted.
+        """
+        self.poll()
+        if self.process is None or not self.ready or self.in_flight is not None:
+            return False
+        if not self.ring.write(frame):
+            return False
+        try:
+            self.conn.send((self.ring.seq, timestamp, profile))
+        except (BrokenPipeError, OSError):
+            self._restart("pipe closed")
+            return False
+        self.in_flight = (self.ring.seq, time.time())
+        return True
+
+    def results(self):
+        """
+        Returns (landmarks[n, 21, 3] normalized, handedness[n] as utils.hand_codec type codes) or None.
+        """
+        self.poll()
+        return self.latest
+
+    def stop(self):
+        if self.conn is not None:
+            try:
+                self.conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            if self.process is not None:
+                self.process.join(timeout=1.0)
+        self._kill()
+        self.ring.close()
@@ -0,0 +1,186 @@
+import threading
+import time
+import cv2
+
+from engine.vision_engine import VisionEngine
+from engine.gesture_engine import GestureEngine
+from engine.hand_history import HandHistory
+from utils.theme import SCREEN_SIZE
+from utils.camera_setup import open_camera
+
+class FpsMeter:
+    def __init__(self, window=1.0):
+        self.window = window
+        self.count = 0
+        self.start = time.time()
+        self.fps = 0.0
+
+    def tick(self):
+        self.count += 1
+        elapsed = time.time() - self.start
+        if elapsed >= self.window:
+            self.fps = self.count / elapsed
+            self.count = 0
+            self.start = time.time()
+
+class FrameSource:
+    """
+    Captures from one camera on its own thread and keeps only the newest frame,
+    so a slow consumer never builds up driver latency.
+    """
+    def __init__(self, source=0, size=SCREEN_SIZE, flip=True):
+        self.source = source
+        self.size = size
+        self.flip = flip
+        self.lock = threading.Lock()
+        self.frame = None
+        self.timestamp = 0
+        self.seq = 0
+        self.consumed_seq = 0
+        self.dropped = 0
+        self.meter = FpsMeter()
+        self.mode = None
+        self._stop = threading.Event()
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self._run, name=f"FrameSource-{self.source}", daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        cap, self.mode = open_camera(self.source, self.size)
+        while not self._stop.is_set():
+            success, frame = cap.read()
+            if not success:
+                time.sleep(0.01)
+                continue
+            if self.flip: frame = cv2.flip(frame, 1)
+            with self.lock:
+                if self.seq > self.consumed_seq: self.dropped += 1
+                self.frame = frame
+                self.timestamp = time.time()
+                self.seq += 1
+            self.meter.tick()
+        cap.release()
+
+    def read_new(self):
+        """
+        Returns (seq, timestamp, frame) if a frame arrived since the last call, else None.
+        """
+        with self.lock:
+            if self.seq == self.consumed_seq: return None
+            self.consumed_seq = self.seq
+            return self.seq, self.timestamp, self.frame
+
+    def stop(self):
+        self._stop.set()
+        if self.thread: self.thread.join(timeout=1.0)
+
+class StreamState:
+    """
+    Per-stream interaction state: each lectern has its own gestures and tool.
+    """
+    def __init__(self):
+        self.history = HandHistory()
+        self.gestures = GestureEngine(self.history)
+        self.current_tool = "PAINTER"
+        self.hands = []
+        self.state = "IDLE"
+
+    def update(self, hands):
+        self.hands = hands
+        self.history.update(hands)
+        self.state = self.gestures.update_state(hands)
+        if self.state == "SELECTED" and self.gestures.selected_tool:
+            self.current_tool = self.gestures.selected_tool
+        return self.state
+
+class Stream:
+    def __init__(self, stream_id, source, vision):
+        self.id = stream_id
+        self.source = source
+        self.vision = vision
+        self.state = StreamState()
+        self.last_served = 0
+        self.last_completed = 0
+        self.inference_meter = FpsMeter()
+
+class StreamPool:
+    """
+    Serves several cameras from one host. Every stream gets a capture thread and
+    a dedicated inference process (VisionEngine worker mode), so throughput scales
+    with cores. poll() serves streams least-recently-served first within a time
+    budget, capped at max_fps per stream, and routes results to each stream's state.
+    """
+    def __init__(self, sources, max_fps=30, poll_budget_ms=8.0, use_gpu=False, use_smoothing=False):
+        self.max_fps = max_fps
+        self.poll_budget_ms = poll_budget_ms
+        self.streams = [Stream(i, FrameSource(src),
+                               VisionEngine(use_gpu=use_gpu, use_smoothing=use_smoothing, use_worker=True))
+                        for i, src in enumerate(sources)]
+
+    def start(self):
+        for stream in self.streams:
+            stream.source.start()
+
+    def poll(self):
+        """
+        Submits fresh frames and collects results. Returns [(stream, frame, hands, state)].
+        """
+        results = []
+        start = time.perf_counter()
+        min_interval = 1.0 / self.max_fps
+
+        # Fairness: whoever waited longest goes first
+        for stream in sorted(self.streams, key=lambda s: s.last_served):
+            if (time.perf_counter() - start) * 1000 > self.poll_budget_ms: break
+            now = time.time()
+            if now - stream.last_served < min_interval: continue
+
+            item = stream.source.read_new()
+            if item is None: continue
+            _, _, frame = item
+
+            hands = stream.vision.process_frame(frame)
+            stream.last_served = now
+            worker = stream.vision.worker
+            if worker is not None and worker.completed != stream.last_completed:
+                stream.last_completed = worker.completed
+                stream.inference_meter.tick()
+            results.append((stream, frame, hands, stream.state.update(hands)))
+        return results
+
+    def stats(self):
+        return [{
+            "stream": s.id,
+            "capture_fps": s.source.meter.fps,
+            "inference_fps": s.inference_meter.fps,
+            "dropped": s.source.dropped,
+            "tool": s.state.current_tool,
+            "restarts": s.vision.worker.restarts if s.vision.worker else 0
+        } for s in self.streams]
+
+    def stop(self):
+        for stream in self.streams:
+            stream.source.stop()
+            stream.vision.close()
+
+if __name__ == "__main__":
+    # Headless throughput check: python -m engine.stream_pool 0 1 2
+    import sys
+    sources = [int(a) if a.isdigit() else a for a in sys.argv[1:]] or [0]
+    pool = StreamPool(sources)
+    pool.start()
+    try:
+        last_report = time.time()
+        while True:
+            pool.poll()
+            time.sleep(0.002)
+            if time.time() - last_report > 2.0:
+                last_report = time.time()
+                for s in pool.stats():
+                    print(f"stream {s['stream']}: capture {s['capture_fps']:.1f} fps, "
+                          f"inference {s['inference_fps']:.1f} fps, dropped {s['dropped']}, tool {s['tool']}")
+    except KeyboardInterrupt:
+        pass
+    pool.stop()
@@ -6,96 +6,241 @@ import numpy as np
 import time
 
 from utils.filters import LandmarkSmoother
+from engine.finger_classifier import FingerClassifier
+from engine.motion_gate import MotionGate
+from utils.buffer_pool import BufferPool
+from utils.hand_codec import decode_type
+
+# Named detector setups. Every tool reads only hands[0], so the tool profiles track a
+# single hand; "single_fast" also keeps tracking through lower-confidence frames
+# instead of falling back to the slower palm detector. "full" is the two-hand default.
+INFERENCE_PROFILES = {
+    "full":        {"num_hands": 2, "detection": 0.5, "presence": 0.5, "tracking": 0.5},
+    "single":      {"num_hands": 1, "detection": 0.5, "presence": 0.5, "tracking": 0.5},
+    "single_fast": {"num_hands": 1, "detection": 0.5, "presence": 0.4, "tracking": 0.3}
+}
+TOOL_PROFILES = {
+    "PAINTER": "single_fast",
+    "PAINTER_ALT": "single_fast",
+    "MEDIA": "single_fast",
+    "KEYBOARD": "single"   # Key presses favour precision over latency
+}
+
+def create_hand_landmarker(model_path="hand_landmarker.task", use_gpu=False, num_hands=2,
+                           detection=0.5, presence=0.5, tracking=0.5):
+    base_options = python.BaseOptions(
+        model_asset_path=model_path,
+        delegate=python.BaseOptions.Delegate.GPU if use_gpu else python.BaseOptions.Delegate.CPU
+    )
+    options = vision.HandLandmarkerOptions(
+        base_options=base_options,
+        running_mode=vision.RunningMode.VIDEO,
+        num_hands=num_hands,
+        min_hand_detection_confidence=detection,
+        min_hand_presence_confidence=presence,
+        min_tracking_confidence=tracking
+    )
+    return vision.HandLandmarker.create_from_options(options)
 
 class VisionEngine:
-    def __init__(self, model_path="hand_landmarker.task", draw_landmarks=True, use_gpu=False, use_smoothing=False):
+    def __init__(self, model_path="hand_landmarker.task", use_gpu=False, use_smoothing=False, use_worker=False,
+                 finger_model=None, idle_after=5.0, idle_interval=0.5, tool_profiles=False,
+                 inference_scale=1.0, smoothing_freq=30):
         self.use_smoothing = use_smoothing
-        self.smoother = LandmarkSmoother() if use_smoothing else None
-        
-        base_options = python.BaseOptions(
-            model_asset_path=model_path,
-            delegate=python.BaseOptions.Delegate.GPU if use_gpu else python.BaseOptions.Delegate.CPU
-        )
-        options = vision.HandLandmarkerOptions(
-            base_options=base_options,
-            running_mode=vision.RunningMode.VIDEO,
-            num_hands=2,
-            min_hand_detection_confidence=0.5,
-            min_hand_presence_confidence=0.5,
-            min_tracking_confidence=0.5
-        )
-        self.detector = vision.HandLandmarker.create_from_options(options)
+        self.smoothing_freq = smoothing_freq # Frame rate the OneEuro filters assume (host profile)
+        self.smoother = LandmarkSmoother(freq=smoothing_freq) if use_smoothing else None
+        self.model_path = model_path
+        self.use_gpu = use_gpu
+
+        # Inference profiles: one pre-built landmarker per profile, so switching never reloads the model
+        self.profiles = tuple(INFERENCE_PROFILES) if tool_profiles else ("full",)
+        self.profile = "full"
+        self.tool = None
+
+        # Out-of-process mode: the worker is spawned on the first frame (needs its shape)
+        self.use_worker = use_worker
+        self.worker = None
+        self.detectors = {} if use_worker else {name: create_hand_landmarker(model_path, use_gpu=use_gpu,
+                                                                             **INFERENCE_PROFILES[name])
+                                                for name in self.profiles}
+        self.detector = self.detectors.get(self.profile)
         self.last_timestamp = 0
-        self.draw_landmarks = draw_landmarks
+
+        # Learned finger states (engine.finger_classifier) replace the rules when a model is given
+        self.classifier = FingerClassifier.load(finger_model) if finger_model else None
+
+        # Runtime quality knobs (driven by FrameGovernor)
+        self.inference_scale = inference_scale # Downscale factor for the model input
+        self.inference_interval = 1  # Run the model every N frames, reuse hands in between
+        self.frame_count = 0
+        self.last_hands = []
+        self.pool = BufferPool() # Model input buffers, reused every frame
+
+        # Idle duty cycle: after idle_after seconds without hands or motion the model
+        # only runs every idle_interval seconds; the motion gate wakes it on the next frame
+        self.idle_after = idle_after # 0 disables
+        self.idle_interval = idle_interval
+        self.gate = MotionGate()
+        self.idle = False
+        self.last_activity = time.time()
+        self.last_inference = 0.0
+
+    def set_smoothing(self, enabled):
+        if enabled and self.smoother is None:
+            self.smoother = LandmarkSmoother(freq=self.smoothing_freq)
+        self.use_smoothing = enabled
+
+    def set_profile(self, name):
+        """
+        Switches to a pre-built profile (unknown names fall back to "full"). Cheap.
+        """
+        if name not in self.profiles: name = "full"
+        if name == self.profile: return
+        self.profile = name
+        self.detector = self.detectors.get(name)
+        print(f"VisionEngine: profile {name} ({INFERENCE_PROFILES[name]['num_hands']} hand(s))")
+
+    def set_tool(self, tool):
+        """
+        Follows the app's current tool (TOOL_PROFILES); a no-op without tool profiles.
+        """
+        self.tool = tool
+        self.set_profile(TOOL_PROFILES.get(tool, "full"))
+
+    def warm_up(self, img):
+        """
+        Runs every pooled landmarker once, so the first frame after a switch is not slow.
+        """
+        current = self.detector
+        for detector in self.detectors.values() or [None]: # Worker mode: one plain frame
+            self.detector = detector
+            self.process_frame(img)
+        self.detector = current
+        self.last_hands = []
 
     def process_frame(self, img):
         """
-        Processes a frame and returns hand data.
+        Processes a frame and returns hand data. The frame is not modified.
         """
         h, w, _ = img.shape
-        timestamp = int(time.time() * 1000)
+        self.frame_count += 1
+        if self.idle_after and self._idle_skip(img):
+            return self.last_hands
+        if self.inference_interval > 1 and self.frame_count % self.inference_interval != 0:
+            return self.last_hands
+
+        self.last_inference = time.time()
+        timestamp = int(self.last_inference * 1000)
         if timestamp <= self.last_timestamp:
             timestamp = self.last_timestamp + 1
         self.last_timestamp = timestamp
 
-        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=cv2.cvtColor(img, cv2.COLOR_BGR2RGB))
+        # Landmarks are normalized, so the model can see a smaller image
+        model_img = img
+        if self.inference_scale < 1.0:
+            mw, mh = int(w * self.inference_scale), int(h * self.inference_scale)
+            model_img = cv2.resize(img, (mw, mh), dst=self.pool.get("model_input", (mh, mw, 3)),
+                                   interpolation=cv2.INTER_AREA)
+
+        if self.use_worker:
+            self.last_hands = self._process_frame_remote(img, model_img, timestamp)
+            return self.last_hands
+
+        rgb = cv2.cvtColor(model_img, cv2.COLOR_BGR2RGB, dst=self.pool.get("model_rgb", model_img.shape))
+        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb)
         result = self.detector.detect_for_video(mp_image, timestamp)
-        
+
         hands_data = []
         if result.hand_landmarks:
             for i, (landmarks, handedness) in enumerate(zip(result.hand_landmarks, result.handedness)):
                 lms = [(int(lm.x * w), int(lm.y * h), lm.z) for lm in landmarks]
-                
-                # Apply Smoothing
-                if self.use_smoothing and self.smoother:
-                    lms = self.smoother.smooth(lms)
-                
-                # Calculate Adaptive Scale (Normalized Unit: 0 to 9 distance)
-                # p0: Wrist, p9: Middle Finger Root
-                p0 = np.array(lms[0][:2])
-                p9 = np.array(lms[9][:2])
-                scale = np.linalg.norm(p0 - p9)
-
-                hand = {
-                    'type': handedness[0].category_name,
-                    'landmarks': lms,
-                    'raw_landmarks': landmarks,
-                    'scale': scale # Base unit for normalization
-                }
-                hand['fingers'] = self._get_fingers(lms, hand['type'])
-                hands_data.append(hand)
-
-                if self.draw_landmarks:
-                    self._draw_landmarks_and_connections(img, lms)
-                
+                hands_data.append(self._build_hand(lms, handedness[0].category_name, landmarks))
+        if self.classifier:
+            self.classifier.apply(hands_data, w)
+
+        self.last_hands = hands_data
+        return hands_data
+
+    def _idle_skip(self, img):
+        """
+        True if this frame's inference can be skipped because nobody is in view.
+        """
+        now = time.time()
+        if self.last_hands:
+            self.last_activity = now
+            self.gate.reset() # Tracking covers presence; the gate restarts when hands leave
+        elif self.gate.update(img):
+            self.last_activity = now
+        idle = now - self.last_activity > self.idle_after
+        if idle != self.idle:
+            self.idle = idle
+            if idle: print(f"VisionEngine: idle, inference every {self.idle_interval}s until motion")
+            else: print("VisionEngine: activity, full-rate inference")
+        return idle and now - self.last_inference < self.idle_interval
+
+    def _process_frame_remote(self, img, model_img, timestamp):
+        from engine.inference_worker import InferenceWorker
+        h, w, _ = img.shape
+        if self.worker is None:
+            self.worker = InferenceWorker(self.model_path, use_gpu=self.use_gpu, shape=img.shape,
+                                          profiles=self.profiles)
+
+        self.worker.submit(model_img, timestamp, self.profile)
+        detections = self.worker.results()
+        if detections is None: return []
+
+        hands_data = []
+        norm_lms, types = detections
+        for landmarks, type_code in zip(norm_lms, types):
+            # Vectorized pixel conversion of the compact array
+            px = (landmarks[:, :2] * (w, h)).astype(int)
+            lms = list(zip(px[:, 0].tolist(), px[:, 1].tolist(), landmarks[:, 2].tolist()))
+            hands_data.append(self._build_hand(lms, decode_type(type_code), landmarks))
+        if self.classifier:
+            self.classifier.apply(hands_data, w)
         return hands_data
 
-    def _draw_landmarks_and_connections(self, img, lms):
-        connections = [
-            (0, 1), (1, 2), (2, 3), (3, 4),
-            (0, 5), (5, 6), (6, 7), (7, 8),
-            (5, 9), (9, 10), (10, 11), (11, 12),
-            (9, 13), (13, 14), (14, 15), (15, 16),
-            (13, 17), (17, 18), (18, 19), (19, 20),
-            (0, 17)
-        ]
-        for start, end in connections:
-            cv2.line(img, (lms[start][0], lms[start][1]), (lms[end][0], lms[end][1]), (0, 255, 0), 2)
-        for lm in lms:
-            cv2.circle(img, (lm[0], lm[1]), 5, (255, 0, 255), cv2.FILLED)
+    def _build_hand(self, lms, hand_type, raw_landmarks):
+        # Apply Smoothing
+        unsmoothed = None
+        if self.use_smoothing and self.smoother:
+            unsmoothed = lms
+            lms = self.smoother.smooth(lms)
+
+        # Calculate Adaptive Scale (Normalized Unit: 0 to 9 distance)
+        # p0: Wrist, p9: Middle Finger Root
+        p0 = np.array(lms[0][:2])
+        p9 = np.array(lms[9][:2])
+        scale = np.linalg.norm(p0 - p9)
+
+        hand = {
+            'type': hand_type,
+            'landmarks': lms,
+            'raw_landmarks': raw_landmarks,
+            'scale': scale # Base unit for normalization
+        }
+        if unsmoothed is not None:
+            hand['unsmoothed_landmarks'] = unsmoothed # Pixel (x, y, z), what the finger classifier was trained on
+        hand['fingers'] = self._get_fingers(lms, hand['type'])
+        return hand
+
+    def close(self):
+        if self.worker is not None:
+            self.worker.stop()
+            self.worker = None
 
     def _get_fingers(self, lms, hand_type):
         fingers = []
         tip_ids = [4, 8, 12, 16, 20]
-        
+
         # Thumb
         if hand_type == "Right":
             fingers.append(1 if lms[tip_ids[0]][0] < lms[tip_ids[0]-1][0] else 0)
         else:
             fingers.append(1 if lms[tip_ids[0]][0] > lms[tip_ids[0]-1][0] else 0)
-            
+
         # 4 Fingers
         for id in range(1, 5):
             fingers.append(1 if lms[tip_ids[id]][1] < lms[tip_ids[id]-2][1] else 0)
-            
+
         return fingers
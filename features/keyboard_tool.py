@@ -15,6 +15,7 @@ class VirtualKeyboard:
         self.text = ""
         self.last_press_time = 0
         self.cooldown = 0.5 # Seconds between typing
+        self.tiles = {} # Pre-rendered key faces by color, blended into the frame in place
 
     def draw(self, img, hands=None):
         """
@@ -45,10 +46,12 @@ class VirtualKeyboard:
                 color = (0, 242, 254) if is_pressed else ((0, 255, 0) if is_hovered else (255, 255, 255))
                 alpha = 220 if is_pressed else (150 if is_hovered else 60)
                 
-                overlay = img.copy()
-                cv2.rectangle(overlay, (x, y), (x + self.key_width, y + self.key_height), color, cv2.FILLED)
-                cv2.rectangle(overlay, (x, y), (x + self.key_width, y + self.key_height), (255, 255, 255), 2)
-                cv2.addWeighted(overlay, alpha/255, img, 1 - alpha/255, 0, img)
+                # Only the key's own pixels are blended (the 2px border reaches 1px outside)
+                tile, outside = self._tile(color)
+                roi = img[y - 1:y - 1 + tile.shape[0], x - 1:x - 1 + tile.shape[1]]
+                keep = roi[outside] # Rounded border corners leave a few tile pixels untouched
+                cv2.addWeighted(tile, alpha/255, roi, 1 - alpha/255, 0, roi)
+                roi[outside] = keep
                 
                 font_scale = 0.8 if len(key) > 1 else 1.2
                 cv2.putText(img, key, (x + 15, y + 55), cv2.FONT_HERSHEY_DUPLEX, font_scale, (255, 255, 255), 2)
@@ -60,6 +63,20 @@ class VirtualKeyboard:
         
         return img
 
+    def _tile(self, color):
+        entry = self.tiles.get(color)
+        if entry is None:
+            shape = (self.key_height + 3, self.key_width + 3)
+            corner, far = (1, 1), (1 + self.key_width, 1 + self.key_height)
+            tile = np.zeros(shape + (3,), dtype=np.uint8)
+            cv2.rectangle(tile, corner, far, color, cv2.FILLED)
+            cv2.rectangle(tile, corner, far, (255, 255, 255), 2)
+            mask = np.zeros(shape, dtype=np.uint8)
+            cv2.rectangle(mask, corner, far, 255, cv2.FILLED)
+            cv2.rectangle(mask, corner, far, 255, 2)
+            entry = self.tiles[color] = (tile, mask == 0)
+        return entry
+
     def _get_dist(self, p1, p2):
         return np.hypot(p1[0]-p2[0], p1[1]-p2[1])
 
@@ -2,46 +2,144 @@ import os
 import cv2
 import numpy as np
 import time
-from collections import deque
+
+from features.slide_atlas import SlideAtlas
+from utils.task_executor import TaskExecutor, cancelled
+
+SLIDE_EXTS = ('.png', '.jpg', '.jpeg', '.bmp', '.webp')
+
+def slide_rect(slide_shape, frame_shape, scale=1.0, offset=(0,0)):
+    """
+    Where a slide lands on the frame: (x1, y1, width, height), before clipping.
+    """
+    fh, fw = frame_shape[:2]
+    
+    # Aspect Ratio Fit with Zoom Scale
+    sh, sw = slide_shape[:2]
+    aspect = sw / sh
+    if fw / fh > aspect:
+        base_h, base_w = fh * 0.9, (fh * 0.9) * aspect
+    else:
+        base_w, base_h = fw * 0.9, (fw * 0.9) / aspect
+        
+    nw, nh = int(base_w * scale), int(base_h * scale)
+    
+    # Centering and Offset
+    x1 = fw // 2 - nw // 2 + int(offset[0])
+    y1 = fh // 2 - nh // 2 + int(offset[1])
+    return x1, y1, nw, nh
 
 class PresentationTool:
-    def __init__(self, folder_path="images", use_kia=False):
+    def __init__(self, history, folder_path="images", use_kia=False, load=True, executor=None):
+        # Shared HandHistory: swipe motion is read from it, not tracked here
+        self.history = history
         self.folder_path = folder_path
         self.slides = []
+        self.files = []                 # File name of each slide, same order
+        self.decoded = {}               # name -> (mtime_ns, size, image); reused on reload
         self.current_idx = 0
         self.visible = True
-        self.load_slides()
+        # Thumbnail atlas for the overview grid, built in the background as slides load
+        self.atlas = SlideAtlas(executor or TaskExecutor(workers=1))
+        if load: self.load_slides()
         
         self.use_kia = use_kia
         
         # KIA (Kinetic Intent Analysis) Parameters
-        self.history = deque(maxlen=8)
+        self.kia_window = 8             # Samples of the swipe gesture to analyse
+        self.gesture_start = None       # HandHistory frame where the current gesture window began
         self.kia_threshold = 0.4       # Increased sensitivity (was 0.8)
         self.consensus_req = 0.7
         
         # Basic Swipe Parameters (Used if kia=False)
-        self.start_x = None
         self.swipe_threshold_ratio = 1.2 # Threshold relative to hand scale
         
         self.swipe_cooldown = 0.6
         self.last_swipe_time = 0
         self.opacity = 1.0             # 100% Opacity as requested
+        
+        # Resized slide cache (slide, size, bgr, alpha, {opacity: weights}); replaced, never edited,
+        # so the operator loop and the audience thread can share it
+        self.resize_cache = None
+
+        # Overview Grid (Three fingers to toggle, point to hover, hold still to pick)
+        self.overview = False
+        self.overview_gesture = [0, 1, 1, 1, 0]
+        self.overview_latch = False     # Toggle gesture still held since the last toggle
+        self.overview_row = 0           # First atlas row on screen
+        self.overview_layout = None     # (x0, y0, rows) of the last draw, in frame pixels
+        self.hover_idx = None
+        self.hover_start = 0
+        self.dwell_time = 0.8           # Seconds on one thumbnail to select it
+        self.scroll_interval = 0.35     # Seconds per row while pointing above / below the grid
+        self.last_scroll = 0
 
     def load_slides(self):
-        if not os.path.exists(self.folder_path): return
-        exts = ('.png', '.jpg', '.jpeg', '.bmp', '.webp')
-        files = [f for f in os.listdir(self.folder_path) if f.lower().endswith(exts)]
-        self.slides = []
-        for f in sorted(files):
-            img = cv2.imread(os.path.join(self.folder_path, f), cv2.IMREAD_UNCHANGED)
-            if img is None: img = cv2.imread(os.path.join(self.folder_path, f))
-            if img is not None: self.slides.append(img)
+        scan = self.scan_slides()
+        if scan: self.apply_slides(*scan)
+
+    def scan_slides(self):
+        """
+        Background half of a (re)load: lists the folder and decodes only files whose
+        mtime or size changed since the last scan. Returns (files, slides), or None
+        if nothing changed or the scan was cancelled.
+        """
+        if not os.path.exists(self.folder_path): return None
+        entries = sorted((e for e in os.scandir(self.folder_path) if e.name.lower().endswith(SLIDE_EXTS) and e.is_file()),
+                         key=lambda e: e.name)
+        decoded, files, slides = {}, [], []
+        first_load = not self.slides
+        for entry in entries:
+            if cancelled(): return None # Shutting down mid-load
+            stat = entry.stat()
+            cached = self.decoded.get(entry.name)
+            if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+                img = cached[2]
+            else:
+                img = cv2.imread(entry.path, cv2.IMREAD_UNCHANGED)
+                if img is None: img = cv2.imread(entry.path)
+                # A file still being written fails to decode; the next change event retries it
+                if img is None: continue
+            decoded[entry.name] = (stat.st_mtime_ns, stat.st_size, img)
+            files.append(entry.name)
+            slides.append(img)
+            if first_load:
+                self.atlas.submit(slides) # Thumbnails appear while the rest still decodes
+        unchanged = files == self.files and all(a is b for a, b in zip(slides, self.slides))
+        self.decoded = decoded
+        return None if unchanged else (files, slides)
+
+    def apply_slides(self, files, slides):
+        """
+        GUI-thread half: swaps the deck in and keeps current_idx on the same file
+        (or the same position if that file is gone).
+        """
+        current = self.files[self.current_idx % len(self.files)] if self.files else None
+        if current in files:
+            self.current_idx = files.index(current)
+        elif slides:
+            self.current_idx = min(self.current_idx, len(slides) - 1)
+        # Swap in one assignment so a background load never exposes a partial list
+        self.files = files
+        self.slides = slides
+        self.atlas.submit(slides) # Only changed arrays are re-thumbnailed
         print(f"PresentationTool: Loaded {len(self.slides)} images.")
 
     def update_gestures(self, hand):
         fingers = hand['fingers']
         curr_time = time.time()
         
+        # 0. Overview Toggle (edge-triggered) and Picking
+        toggle = fingers == self.overview_gesture
+        if toggle and not self.overview_latch and self.slides:
+            self.overview = not self.overview
+            self.overview_row = max(0, self.current_idx // self.atlas.cols - 1)
+            self.hover_idx = None
+        self.overview_latch = toggle
+        if self.overview:
+            self._overview_gestures(hand, curr_time)
+            return
+        
         # 1. Visibility Logic (Palm to Show, Fist/Thumb-only to Hide)
         if fingers == [1, 1, 1, 1, 1]: # Palm
             self.visible = True
@@ -50,23 +148,24 @@ class PresentationTool:
             
         # 2. Swipe Detection (Only if visible and Palm gesture)
         if self.visible and fingers == [0, 1, 1, 1, 1]:
+            frame_idx = self.history.frame_idx
+            if self.gesture_start is None:
+                self.gesture_start = frame_idx
+            # Samples of this gesture still in the buffer (hand loss resets the history count)
+            samples = min(frame_idx - self.gesture_start + 1, self.history.available(0))
+            scale = hand.get('scale', 100)
+            
             if self.use_kia:
-                # KIA Logic
-                curr_pos = np.array(hand['landmarks'][9][:2])
-                scale = hand.get('scale', 100)
-                self.history.append(curr_pos)
-                
-                if len(self.history) == self.history.maxlen and (curr_time - self.last_swipe_time > self.swipe_cooldown):
-                    vectors = []
-                    for i in range(1, len(self.history)):
-                        vectors.append((self.history[i] - self.history[i-1]) / scale)
+                # KIA Logic (vectorized over the shared history window)
+                if samples >= self.kia_window and (curr_time - self.last_swipe_time > self.swipe_cooldown):
+                    xs = self.history.window(0, self.kia_window, landmark=9)[:, 0]
+                    steps = np.diff(xs) / scale
                     
-                    dx_sum = sum(v[0] for v in vectors)
-                    directions = [np.sign(v[0]) for v in vectors if abs(v[0]) > 0.01]
+                    dx_sum = steps.sum()
+                    directions = np.sign(steps[np.abs(steps) > 0.01])
                     
-                    if directions:
-                        most_common_dir = np.sign(dx_sum)
-                        consensus = directions.count(most_common_dir) / len(directions)
+                    if directions.size:
+                        consensus = np.count_nonzero(directions == np.sign(dx_sum)) / directions.size
                         
                         if consensus >= self.consensus_req and abs(dx_sum) > self.kia_threshold:
                             if len(self.slides) > 1:
@@ -74,54 +173,153 @@ class PresentationTool:
                                 else: self.current_idx = (self.current_idx + 1) % len(self.slides)
                                 print(f"KIA Swipe Triggered: {self.current_idx}")
                             self.last_swipe_time = curr_time
-                            self.history.clear()
+                            self.gesture_start = frame_idx + 1
             else:
                 # Basic Displacement Logic (Adaptive)
-                curr_x = hand['landmarks'][9][0]
-                scale = hand.get('scale', 100)
                 if self.last_swipe_time + self.swipe_cooldown < curr_time:
-                    if self.start_x is None:
-                        self.start_x = curr_x
-                    else:
-                        dx = curr_x - self.start_x
-                        # Adaptive threshold: 1.2 * hand size
-                        if abs(dx) > (self.swipe_threshold_ratio * scale):
-                            if len(self.slides) > 1:
-                                if dx > 0: self.current_idx = (self.current_idx - 1) % len(self.slides)
-                                else: self.current_idx = (self.current_idx + 1) % len(self.slides)
-                                print(f"Basic Swipe Triggered: {self.current_idx}")
-                            self.last_swipe_time = curr_time
-                            self.start_x = None
+                    dx = self.history.displacement(0, landmark=9, frames=samples - 1)[0]
+                    # Adaptive threshold: 1.2 * hand size
+                    if abs(dx) > (self.swipe_threshold_ratio * scale):
+                        if len(self.slides) > 1:
+                            if dx > 0: self.current_idx = (self.current_idx - 1) % len(self.slides)
+                            else: self.current_idx = (self.current_idx + 1) % len(self.slides)
+                            print(f"Basic Swipe Triggered: {self.current_idx}")
+                        self.last_swipe_time = curr_time
+                        self.gesture_start = frame_idx + 1
                 else:
-                    self.start_x = None
+                    self.gesture_start = None
         else:
-            self.history.clear()
-            self.start_x = None
+            self.gesture_start = None
+
+    def _overview_gestures(self, hand, curr_time):
+        """
+        Index fingertip over a thumbnail hovers it; staying on it for dwell_time picks
+        it. Pointing above / below the grid scrolls; a fist closes the overview.
+        """
+        self.gesture_start = None
+        fingers = hand['fingers']
+        if fingers[1:] == [0, 0, 0, 0]:
+            self.overview = False
+            return
+        if self.overview_layout is None or not (fingers[1] == 1 and fingers[2] == 0):
+            self.hover_idx = None # Only a pointing index finger (middle down) hovers
+            return
+        x0, y0, rows = self.overview_layout
+        _, count = self.atlas.snapshot()
+        cw, ch = self.atlas.cell
+        x, y = hand['landmarks'][8][:2]
+
+        # Scroll zones outside the visible rows
+        total_rows = -(-count // self.atlas.cols)
+        if y < y0 or y >= y0 + rows * ch:
+            step = -1 if y < y0 else 1
+            if curr_time - self.last_scroll > self.scroll_interval:
+                self.overview_row = int(np.clip(self.overview_row + step, 0, max(0, total_rows - rows)))
+                self.last_scroll = curr_time
+            self.hover_idx = None
+            return
+
+        col, row = int((x - x0) // cw), int((y - y0) // ch) + self.overview_row
+        idx = row * self.atlas.cols + col
+        if not 0 <= col < self.atlas.cols or idx >= count:
+            self.hover_idx = None
+            return
+        if idx != self.hover_idx:
+            self.hover_idx, self.hover_start = idx, curr_time
+        elif curr_time - self.hover_start >= self.dwell_time:
+            self.current_idx = idx
+            self.visible = True
+            self.overview = False
+            print(f"Overview Pick: {self.current_idx}")
+
+    def overview_progress(self):
+        """
+        Dwell progress on the hovered thumbnail, 0..1.
+        """
+        if self.hover_idx is None: return 0.0
+        return min(1.0, (time.time() - self.hover_start) / self.dwell_time)
+
+    def draw_overview(self, frame):
+        """
+        The thumbnail grid: one copy of the visible atlas rows onto the frame, plus
+        outlines for the current and hovered slides. No resizing or decoding here.
+        """
+        atlas, count = self.atlas.snapshot()
+        if atlas is None: return frame
+        fh, fw = frame.shape[:2]
+        cw, ch = self.atlas.cell
+        gap = self.atlas.gap
+        rows = max(1, (fh - 2 * ch) // ch) # One cell height of scroll zone above and below
+        total_rows = -(-count // self.atlas.cols)
+        self.overview_row = int(np.clip(self.overview_row, 0, max(0, total_rows - rows)))
+        x0, y0 = (fw - atlas.shape[1]) // 2, ch
+
+        # 1. Blit
+        sx = max(0, -x0)
+        src = atlas[self.overview_row * ch:(self.overview_row + rows) * ch + gap, sx:sx + fw]
+        frame[y0:y0 + src.shape[0], x0 + sx:x0 + sx + src.shape[1]] = src
+        self.overview_layout = (x0 + gap // 2, y0 + gap // 2, rows)
+
+        # 2. Outlines (current slide green, hovered cyan with dwell progress)
+        tw, th = self.atlas.thumb_size
+        for idx, color in ((self.current_idx % count if count else None, (0, 255, 0)), (self.hover_idx, (254, 242, 0))):
+            if idx is None or not self.overview_row <= idx // self.atlas.cols < self.overview_row + rows: continue
+            x, y = self.atlas.cell_origin(idx)
+            x, y = x0 + x, y0 + y - self.overview_row * ch
+            cv2.rectangle(frame, (x - 3, y - 3), (x + tw + 2, y + th + 2), color, 2)
+            if idx == self.hover_idx:
+                cv2.line(frame, (x, y + th + 5), (x + int(tw * self.overview_progress()), y + th + 5), color, 3)
+        return frame
+
+    def _resized(self, slide, nw, nh):
+        """
+        Slide at its on-screen size, cached until the slide or the size changes.
+        Returns (bgr, alpha entry or None for opaque slides).
+        """
+        cached = self.resize_cache
+        if cached is not None and cached[0] is slide and cached[1] == (nw, nh):
+            return cached[2], cached[3]
+        resized = cv2.resize(slide, (nw, nh))
+        alpha = None
+        if resized.shape[2] == 4:
+            alpha = (resized[:, :, 3].astype(np.float32) / 255.0, {})
+            resized = np.ascontiguousarray(resized[:, :, :3])
+        self.resize_cache = (slide, (nw, nh), resized, alpha)
+        return resized, alpha
+
+    def _alpha_weights(self, alpha, opacity):
+        base, by_opacity = alpha
+        weights = by_opacity.get(opacity)
+        if weights is None:
+            w_slide = base * opacity
+            weights = by_opacity[opacity] = (w_slide, 1.0 - w_slide)
+        return weights
+
+    def current_slide(self):
+        """
+        The slide image on screen, or None when hidden / nothing loaded.
+        """
+        slides = self.slides
+        if not slides or not self.visible: return None
+        return slides[self.current_idx % len(slides)]
 
     def draw(self, frame, scale=1.0, offset=(0,0), opacity=None):
-        if not self.slides or not self.visible: return frame
+        return self.draw_slide(frame, self.current_slide(), scale, offset, opacity)
+
+    def draw_slide(self, frame, slide, scale=1.0, offset=(0,0), opacity=None):
+        """
+        Blends a given slide onto the frame. Reads no tool state besides the
+        default opacity, so it is safe to call from the audience render thread.
+        """
+        if slide is None: return frame
 
         # Use custom opacity if provided, else fall back to default
         active_opacity = opacity if opacity is not None else self.opacity
         
-        slide = self.slides[self.current_idx]
         fh, fw = frame.shape[:2]
-        
-        # Aspect Ratio Fit with Zoom Scale
-        sh, sw = slide.shape[:2]
-        aspect = sw / sh
-        if fw / fh > aspect:
-            base_h, base_w = fh * 0.9, (fh * 0.9) * aspect
-        else:
-            base_w, base_h = fw * 0.9, (fw * 0.9) / aspect
-            
-        nw, nh = int(base_w * scale), int(base_h * scale)
+        x1, y1, nw, nh = slide_rect(slide.shape, frame.shape, scale, offset)
         if nw <= 0 or nh <= 0: return frame
-        slide_resized = cv2.resize(slide, (nw, nh))
-        
-        # Centering and Offset
-        x1 = fw // 2 - nw // 2 + int(offset[0])
-        y1 = fh // 2 - nh // 2 + int(offset[1])
+        slide_resized, weights = self._resized(slide, nw, nh)
         x2, y2 = x1 + nw, y1 + nh
         
         # Dynamic Boundary Clipping
@@ -137,11 +335,10 @@ class PresentationTool:
         slide_part = slide_resized[sy1:sy2, sx1:sx2]
         roi = frame[oy1:oy2, ox1:ox2]
         
-        # Weighted Blending
-        if slide_part.shape[2] == 4: # Source Alpha Support
-            alpha = (slide_part[:, :, 3] / 255.0) * active_opacity
-            for c in range(3):
-                roi[:, :, c] = (alpha * slide_part[:, :, c] + (1 - alpha) * roi[:, :, c]).astype(np.uint8)
+        # Weighted Blending (in place, no per-frame temporaries)
+        if weights is not None: # Source Alpha Support
+            w_slide, w_frame = self._alpha_weights(weights, active_opacity)
+            cv2.blendLinear(slide_part, roi, w_slide[sy1:sy2, sx1:sx2], w_frame[sy1:sy2, sx1:sx2], dst=roi)
         else:
             cv2.addWeighted(slide_part, active_opacity, roi, 1 - active_opacity, 0, roi)
             
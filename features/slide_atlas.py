@@ -0,0 +1,125 @@
+import threading
+import cv2
+import numpy as np
+
+from utils.task_executor import PRIORITY_PREFETCH, cancelled
+
+class SlideAtlas:
+    """
+    Every slide's thumbnail packed into one BGR image: a grid `cols` cells wide,
+    slide i in cell (i // cols, i % cols). Built as prefetch work on a TaskExecutor, so it
+    yields to user-visible loads; submit() hands over the slide list and only slides
+    whose array changed are re-thumbnailed. One build task runs at a time.
+    The published atlas is replaced, never edited, so the GUI thread blits from it
+    without locking.
+    """
+    def __init__(self, executor, cols=8, thumb_size=(144, 81), gap=8, background=(40, 40, 40), publish_every=8):
+        self.executor = executor
+        self.cols = cols
+        self.thumb_size = thumb_size
+        self.gap = gap
+        self.cell = (thumb_size[0] + gap, thumb_size[1] + gap)
+        self.background = background
+        self.publish_every = publish_every # Thumbnails between publishes while building
+
+        # Published (atlas, slide count), swapped in one assignment
+        self.published = (None, 0)
+
+        # Builder state (build task only)
+        self.work = None
+        self.sources = []         # Slide arrays the working atlas shows, by index
+
+        self.lock = threading.Lock()
+        self.pending = None
+        self.task = None          # Queued or running build task
+
+    def submit(self, slides):
+        """
+        Queues a rebuild for this slide list. Cheap; older pending lists are dropped.
+        """
+        with self.lock:
+            self.pending = list(slides)
+            if self.task is None: # A running task picks the new list up when it finishes
+                self.task = self.executor.submit(self._run, priority=PRIORITY_PREFETCH, name="atlas")
+
+    def cell_origin(self, index):
+        """
+        Top-left of a slide's thumbnail in atlas pixels.
+        """
+        row, col = divmod(index, self.cols)
+        return self.gap + col * self.cell[0], self.gap + row * self.cell[1]
+
+    def _run(self):
+        while not cancelled():
+            with self.lock:
+                slides, self.pending = self.pending, None
+                if slides is None:
+                    self.task = None
+                    return
+            try:
+                self._build(slides)
+            except Exception as e:
+                print(f"SlideAtlas: build failed: {e}")
+
+    def _build(self, slides):
+        # 1. Grow / shrink the working atlas; cells keep their place, so old ones carry over
+        rows = max(1, -(-len(slides) // self.cols))
+        shape = (self.gap + rows * self.cell[1], self.gap + self.cols * self.cell[0], 3)
+        if self.work is None or self.work.shape != shape:
+            work = np.empty(shape, dtype=np.uint8)
+            work[:] = self.background
+            if self.work is not None:
+                h = min(shape[0], self.work.shape[0])
+                work[:h] = self.work[:h]
+            self.work = work
+        # Cells past the end (slides removed) go blank
+        for index in range(len(slides), min(len(self.sources), rows * self.cols)):
+            self._clear_cell(index)
+        self.sources = self.sources[:len(slides)]
+
+        # 2. Thumbnail only what changed, publishing as it goes so the overview fills in
+        changed = 0
+        for index, slide in enumerate(slides):
+            if cancelled(): return
+            if index < len(self.sources) and self.sources[index] is slide: continue
+            self._clear_cell(index)
+            self._draw_thumbnail(index, slide)
+            if index < len(self.sources): self.sources[index] = slide
+            else: self.sources.append(slide)
+            changed += 1
+            if changed % self.publish_every == 0:
+                self._publish(len(slides))
+        atlas, count = self.published
+        if changed or atlas is None or count != len(slides):
+            self._publish(len(slides))
+
+    def _clear_cell(self, index):
+        x, y = self.cell_origin(index)
+        self.work[y:y + self.thumb_size[1], x:x + self.thumb_size[0]] = self.background
+
+    def _draw_thumbnail(self, index, slide):
+        tw, th = self.thumb_size
+        sh, sw = slide.shape[:2]
+        f = min(tw / sw, th / sh)
+        nw, nh = max(1, int(sw * f)), max(1, int(sh * f))
+        thumb = cv2.resize(slide, (nw, nh), interpolation=cv2.INTER_AREA)
+        if thumb.ndim == 2:
+            thumb = cv2.cvtColor(thumb, cv2.COLOR_GRAY2BGR)
+        x, y = self.cell_origin(index)
+        x, y = x + (tw - nw) // 2, y + (th - nh) // 2
+        roi = self.work[y:y + nh, x:x + nw]
+        if thumb.shape[2] == 4:
+            # Transparent slides over the cell background
+            alpha = thumb[:, :, 3:] / 255.0
+            roi[:] = (thumb[:, :, :3] * alpha + roi * (1 - alpha)).astype(np.uint8)
+        else:
+            roi[:] = thumb
+
+    def _publish(self, count):
+        self.published = (self.work.copy(), min(count, len(self.sources)))
+
+    def snapshot(self):
+        """
+        (atlas, slide count), or (None, 0) before the first build.
+        """
+        return self.published
@@ -5,8 +5,7 @@ class ZoomTool:
         self.scale = 1.0
         self.offset = [0, 0] # [x, y]
         
-        self.last_dist = None
-        self.last_center = None
+        self.was_pinching = False
         self.sensitivity_scale = 0.005
         self.sensitivity_move = 1.0
 
@@ -23,24 +22,18 @@ class ZoomTool:
         is_pinching = (hand['fingers'] == [1, 1, 0, 0, 0])
         return raw_dist, center, is_pinching, norm_dist
 
-    def update(self, dist, center, is_pinching):
-        if is_pinching:
+    def update(self, diff_dist, diff_center, is_pinching):
+        """
+        Applies frame-to-frame pinch deltas (from HandHistory.pinch_delta).
+        The first pinching frame only arms the gesture.
+        """
+        if is_pinching and self.was_pinching:
             # 1. Scaling
-            if self.last_dist is not None:
-                diff_dist = dist - self.last_dist
-                self.scale = max(0.1, min(self.scale + diff_dist * self.sensitivity_scale, 10.0))
+            self.scale = max(0.1, min(self.scale + diff_dist * self.sensitivity_scale, 10.0))
             
             # 2. Translation (Moving)
-            if self.last_center is not None:
-                dx = center[0] - self.last_center[0]
-                dy = center[1] - self.last_center[1]
-                self.offset[0] += dx * self.sensitivity_move
-                self.offset[1] += dy * self.sensitivity_move
-            
-            self.last_dist = dist
-            self.last_center = center
-        else:
-            self.last_dist = None
-            self.last_center = None
-            
+            self.offset[0] += float(diff_center[0]) * self.sensitivity_move
+            self.offset[1] += float(diff_center[1]) * self.sensitivity_move
+        
+        self.was_pinching = is_pinching
         return self.scale, self.offset
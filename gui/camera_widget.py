@@ -3,6 +3,7 @@ import numpy as np
 from PySide6.QtCore import QThread, Signal, Qt
 from PySide6.QtGui import QImage
 from core.detector import HandTracker
+from engine.stream_pool import FrameSource
 from utils.config import WIDTH, HEIGHT
 
 class CameraThread(QThread):
@@ -14,19 +15,19 @@ class CameraThread(QThread):
         self.tracker = HandTracker()
 
     def run(self):
-        cap = cv2.VideoCapture(0)
-        cap.set(cv2.CAP_PROP_FRAME_WIDTH, WIDTH)
-        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, HEIGHT)
+        # Same capture path as StreamPool: negotiated mode, newest frame only (already mirrored)
+        source = FrameSource(0, (WIDTH, HEIGHT))
+        source.start()
 
         while self._run_flag:
-            success, img = cap.read()
-            if success:
-                img = cv2.flip(img, 1)
-                hands, img = self.tracker.find_hands(img)
-                self.change_pixmap_signal.emit(img, hands)
-            else:
-                break
-        cap.release()
+            item = source.read_new()
+            if item is None:
+                self.msleep(2)
+                continue
+            _, _, img = item # A fresh array per frame: the tracker may draw on it
+            hands, img = self.tracker.find_hands(img)
+            self.change_pixmap_signal.emit(img, hands)
+        source.stop()
 
     def stop(self):
         self._run_flag = False
@@ -1,19 +1,39 @@
+import time
+STARTUP_T0 = time.perf_counter()
+
+import os
 import sys
+import threading
 import cv2
 import numpy as np
 import argparse
 from PySide6.QtWidgets import QApplication, QMainWindow, QLabel, QStackedWidget
-from PySide6.QtCore import Qt, QTimer, QPoint
+from PySide6.QtCore import Qt, QTimer, QPoint, QFileSystemWatcher
 from PySide6.QtGui import QImage, QPixmap
 
-from engine.vision_engine import VisionEngine
+# VisionEngine (MediaPipe) and the keyboard tool are imported lazily on first use
 from engine.gesture_engine import GestureEngine
+from engine.hand_history import HandHistory
+from engine.frame_governor import FrameGovernor
 from ui.radial_widget import RadialMenuWidget
 from ui.overlay_canvas import OverlayCanvas
-from features.keyboard_tool import VirtualKeyboard
+from ui.hud_widget import HudWidget
+from ui.audience_renderer import AudienceRenderer
 from features.zoom_tool import ZoomTool
-from features.presentation_tool import PresentationTool
+from features.presentation_tool import PresentationTool, SLIDE_EXTS
 from utils.theme import SCREEN_SIZE
+from utils.config import ERASER_THICKNESS
+from utils.shm_ring import SharedFrameWriter
+from utils.recorder import SessionRecorder
+from utils.stream_server import AudienceStreamServer
+from utils.event_stream import EventPublisher, EVENT_MENU_OPENED, EVENT_TOOL_SWITCHED, EVENT_LAYER_CLEARED
+from utils.startup_profile import StartupProfiler
+from utils.camera_setup import open_camera
+from utils.host_profile import load_profile
+from utils.slide_export import SlideExporter
+from utils.task_executor import TaskExecutor, PRIORITY_USER, PRIORITY_PREFETCH
+from utils.buffer_pool import BufferPool, AllocationMonitor
+from utils.landmark_trace import TraceWriter, TraceReplayer
 
 class AudienceWindow(QMainWindow):
     def __init__(self):
@@ -33,17 +53,47 @@ class AudienceWindow(QMainWindow):
         super().resizeEvent(event)
 
 class AIModernPainter(QMainWindow):
-    def __init__(self, show_landmarks=True, use_gpu=False, use_smooth=False, adaptive=False, dual_window=False, use_kia=False):
+    def __init__(self, show_landmarks=True, use_gpu=False, use_smooth=False, adaptive=False, dual_window=False, use_kia=False,
+                 shm_output=None, use_worker=False, record_path=None, record_operator=False, profiler=None,
+                 budget_ms=None, serve_port=None, serve_host="127.0.0.1",
+                 publish_address=None, probe_camera=False, audience_fps=30, finger_model=None,
+                 export_dir="exports", debug_alloc=False, idle_after=5.0, tool_profiles=True,
+                 trace_path=None, replay_path=None, replay_fast=False, host_profile=None):
         super().__init__()
+        self.profiler = profiler or StartupProfiler()
         self.setWindowTitle("AI Modern Virtual Painter - Pro Edition")
         self.resize(SCREEN_SIZE[0], SCREEN_SIZE[1])
         self.adaptive = adaptive
         
+        # Adaptive Quality (user flags act as ceilings the governor can only lower)
+        self.show_landmarks = show_landmarks
+        self.use_smooth = use_smooth
+        # Calibrated settings for this host (--calibrate); ceilings like the flags above
+        self.host_profile = host_profile or {}
+        self.scale_mode = Qt.SmoothTransformation if self.host_profile.get("smooth_scaling", True) else Qt.FastTransformation
+        self.governor = FrameGovernor(budget_ms) if budget_ms else None
+        
         # Dual Window Support
         self.audience_win = AudienceWindow() if dual_window else None
         if self.audience_win:
             self.audience_win.show()
         
+        # Shared-Memory Output (Composited Audience Feed for local consumers)
+        self.shm_writer = SharedFrameWriter(shm_output, shape=(SCREEN_SIZE[1], SCREEN_SIZE[0], 3)) if shm_output else None
+        
+        # Network Streaming (MJPEG / WebSocket viewers)
+        self.stream_server = AudienceStreamServer(serve_host, serve_port) if serve_port else None
+        
+        # Tracking Data Publisher (Binary landmark records + gesture events)
+        self.publisher = EventPublisher(publish_address) if publish_address else None
+        
+        # Session Recording (Audience feed, optionally the operator view)
+        self.recorder = SessionRecorder(record_path, frame_size=SCREEN_SIZE) if record_path else None
+        self.operator_recorder = None
+        if record_path and record_operator:
+            root, ext = os.path.splitext(record_path)
+            self.operator_recorder = SessionRecorder(f"{root}_operator{ext}", frame_size=SCREEN_SIZE)
+        
         # 1. Video Layer
         self.video_label = QLabel(self)
         self.video_label.setScaledContents(True)
@@ -51,58 +101,225 @@ class AIModernPainter(QMainWindow):
         # 2. Drawing Layer
         self.canvas = OverlayCanvas(self)
         
-        # 3. Radial Menu Layer
+        # 3. Operator HUD Layer (Landmarks, Cursor, Status - never burned into the frame)
+        self.hud = HudWidget(self, show_landmarks=show_landmarks)
+        
+        # 4. Radial Menu Layer
         self.radial_menu = RadialMenuWidget(self)
         
         # Tools
-        self.vision = VisionEngine(draw_landmarks=show_landmarks, 
-                                   use_gpu=use_gpu, 
-                                   use_smoothing=use_smooth)
-        self.gestures = GestureEngine()
-        self.keyboard = VirtualKeyboard()
+        # Model load + warm-up run in the background; frames show without hands until ready
+        self.vision = None
+        self.vision_loading = not replay_path # A replay brings its own hands
+        if self.vision_loading:
+            threading.Thread(target=self._load_vision, name="ModelLoader", daemon=True,
+                             kwargs=dict(use_gpu=use_gpu, 
+                                         use_smoothing=use_smooth,
+                                         use_worker=use_worker,
+                                         finger_model=finger_model,
+                                         idle_after=idle_after,
+                                         tool_profiles=tool_profiles,
+                                         inference_scale=self.host_profile.get("inference_scale", 1.0),
+                                         smoothing_freq=self.host_profile.get("smoothing_freq", 30))).start()
+        self.history = HandHistory()
+        self.gestures = GestureEngine(self.history)
+        self._keyboard = None
         self.zoom_tool = ZoomTool()
-        self.present_tool = PresentationTool(use_kia=use_kia)
+        # Heavy actions (slide decode, thumbnails, export, lazy imports) run here, never on the frame loop
+        self.executor = TaskExecutor(workers=3)
+        self.present_tool = PresentationTool(self.history, use_kia=use_kia, load=False, executor=self.executor)
+        self.slides_ready = False
+        # Decoded on a worker, swapped in on the GUI thread like every reload
+        self.executor.submit(self._scan_slides, priority=PRIORITY_USER, name="slides",
+                             on_done=self._slides_loaded, on_error=lambda _: self._slides_loaded(None))
+        
+        # Slide Folder Hot-Reload (debounced; a reload re-decodes only added / changed files)
+        self.slide_watcher = QFileSystemWatcher(self)
+        self.slide_watcher.directoryChanged.connect(self._slides_changed)
+        self.slide_watcher.fileChanged.connect(self._slides_changed)
+        self.reload_timer = QTimer(self)
+        self.reload_timer.setSingleShot(True)
+        self.reload_timer.setInterval(300) # Editors and copies write in bursts
+        self.reload_timer.timeout.connect(self._reload_slides)
+        self.reload_task = None
+        self.reload_again = False
+        
+        # Audience Rendering (own thread and rate; shares only immutable snapshots with this loop)
+        self.audience_fps = audience_fps
+        self.audience = None
+        if self.audience_win or self.shm_writer or self.recorder or self.stream_server:
+            self.audience = AudienceRenderer(self.present_tool, fps=audience_fps,
+                                             recorder=self.recorder,
+                                             shm_writer=self.shm_writer,
+                                             stream_server=self.stream_server,
+                                             window=self.audience_win is not None)
+            self.audience.frame_ready.connect(self._show_audience)
+        
+        # Landmark Traces (--trace saves process_frame output, --replay feeds it back without camera or model)
+        self.trace = TraceWriter(trace_path) if trace_path else None
+        self.replayer = TraceReplayer(replay_path, realtime=not replay_fast) if replay_path else None
+        self.blank = np.zeros((SCREEN_SIZE[1], SCREEN_SIZE[0], 3), dtype=np.uint8) if replay_path else None
+        
+        # Handout Export (Ctrl+E: PDF, Ctrl+Shift+E: PNG set; runs in a process pool)
+        self.exporter = SlideExporter(self.executor, export_dir)
+        self.exporter.progress.connect(lambda done, total: self._set_export_status(f"Exporting slides {done}/{total}"))
+        self.exporter.finished.connect(lambda path: self._set_export_status(f"Exported: {path}", hold=4.0))
+        self.exporter.failed.connect(lambda error: self._set_export_status(f"Export failed: {error}", hold=4.0))
+        self.export_status = None
+        self.export_status_until = 0
         
         # App State
         self.current_tool = "PAINTER"
         self.brush_thickness = 10
-        self.cap = cv2.VideoCapture(0)
-        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, SCREEN_SIZE[0])
-        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, SCREEN_SIZE[1])
+        self.cap = None
+        self.probe_camera = probe_camera
+        
+        # Per-frame buffers (written with dst=, never reallocated in steady state)
+        self.pool = BufferPool()
+        self.frame_shape = None
+        self.alloc_monitor = AllocationMonitor(SCREEN_SIZE[0] * SCREEN_SIZE[1] * 3) if debug_alloc else None
         
-        # Main Loop
+        # Main Loop (Camera opens once the window is up)
         self.timer = QTimer()
         self.timer.timeout.connect(self.update_frame)
-        self.timer.start(16) # ~60 FPS
+        QTimer.singleShot(0, self._start_capture)
+
+    @property
+    def keyboard(self):
+        if self._keyboard is None:
+            from features.keyboard_tool import VirtualKeyboard # Usually already prefetched
+            self._keyboard = VirtualKeyboard()
+        return self._keyboard
+
+    @staticmethod
+    def _prefetch_keyboard():
+        import features.keyboard_tool
+
+    def _load_vision(self, **kwargs):
+        try:
+            with self.profiler.phase("model load"):
+                from engine.vision_engine import VisionEngine
+                vision = VisionEngine(**kwargs)
+            with self.profiler.phase("model warm-up"):
+                vision.warm_up(np.zeros((SCREEN_SIZE[1], SCREEN_SIZE[0], 3), dtype=np.uint8))
+            self.vision = vision
+            if self.governor:
+                self._apply_quality()
+        except Exception as e:
+            print(f"VisionEngine failed to load: {e}")
+        finally:
+            self.vision_loading = False
+
+    def _scan_slides(self):
+        with self.profiler.phase("slides"):
+            return self.present_tool.scan_slides()
+
+    def _slides_loaded(self, scan):
+        if scan: self.present_tool.apply_slides(*scan)
+        self.slides_ready = True
+        self._watch_slides()
+
+    def _watch_slides(self):
+        # The folder catches adds / removes / renames, the files catch in-place edits.
+        # Replaced files drop out of the watcher, so the list is refreshed after every reload
+        folder = self.present_tool.folder_path
+        if not os.path.isdir(folder): return
+        paths = [folder] + [os.path.join(folder, f) for f in sorted(os.listdir(folder))
+                            if f.lower().endswith(SLIDE_EXTS)]
+        watched = self.slide_watcher.files() + self.slide_watcher.directories()
+        stale = [p for p in watched if p not in paths]
+        if stale: self.slide_watcher.removePaths(stale)
+        missing = [p for p in paths if p not in watched]
+        if missing: self.slide_watcher.addPaths(missing)
+
+    def _slides_changed(self, path):
+        self.reload_timer.start() # Restart: reload once things settle
+
+    def _reload_slides(self):
+        if self.reload_task is not None and not self.reload_task.done:
+            self.reload_again = True # Rescan once the running one lands
+            return
+        self.reload_task = self.executor.submit(self.present_tool.scan_slides, priority=PRIORITY_USER,
+                                                name="slide reload", on_done=self._slides_scanned)
+
+    def _slides_scanned(self, scan):
+        if scan: self.present_tool.apply_slides(*scan)
+        self._watch_slides()
+        if self.reload_again:
+            self.reload_again = False
+            self._reload_slides()
+
+    def _start_capture(self):
+        self.profiler.mark("window shown")
+        self.executor.submit(self._prefetch_keyboard, priority=PRIORITY_PREFETCH, name="keyboard import")
+        if self.replayer:
+            self.timer.start(4 if self.replayer.realtime else 0)
+            return
+        # Probing (first launch, --probe-camera) measures several modes for seconds: off the GUI thread
+        self.executor.submit(self._open_camera, priority=PRIORITY_USER, name="camera open",
+                             on_done=self._camera_ready, on_error=self._camera_failed)
+
+    def _open_camera(self):
+        with self.profiler.phase("camera open"):
+            # Fastest FOURCC/FPS at SCREEN_SIZE with a 1-frame driver buffer (cached per device)
+            return open_camera(0, SCREEN_SIZE, reprobe=self.probe_camera)
+
+    def _camera_ready(self, result):
+        self.cap, self.capture_mode = result
+        self.timer.start(self.host_profile.get("timer_ms", 16)) # ~60 FPS unless calibrated slower
+
+    def _camera_failed(self, error):
+        # Negotiation broke (driver error mid-probe): plain capture at SCREEN_SIZE, driver defaults otherwise
+        print(f"CameraSetup: mode negotiation failed ({error}), opening with driver defaults")
+        self.cap = cv2.VideoCapture(0)
+        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, SCREEN_SIZE[0])
+        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, SCREEN_SIZE[1])
+        self.capture_mode = None
+        self.timer.start(self.host_profile.get("timer_ms", 16))
 
     def update_frame(self):
-        success, frame = self.cap.read()
-        if not success: return
-        
-        frame = cv2.flip(frame, 1)
+        if self.alloc_monitor:
+            self.alloc_monitor.begin()
+        if self.replayer:
+            item = self.replayer.next_frame()
+            if item is None:
+                if self.replayer.finished: self._finish_replay()
+                return
+            frame_time, replay_hands = item
+            capture = self.blank
+        else:
+            # The audience renderer copies what it keeps, so one capture buffer is enough
+            capture = self.pool.get("capture", self.frame_shape) if self.frame_shape else None
+            success, capture = self.cap.read(capture)
+            if not success: return
+            frame_time = time.time()
+        self.frame_shape = capture.shape
+        tick_start = time.perf_counter()
+        if not self.profiler.reported:
+            self._track_startup()
         
-        # Prepare Audience Frame (Clean + 100% Opacity)
-        if self.audience_win:
-            clean_frame = frame.copy()
-            clean_frame = self.present_tool.draw(clean_frame, 
-                                                scale=self.zoom_tool.scale, 
-                                                offset=self.zoom_tool.offset,
-                                                opacity=1.0)
-            # Overlay drawings manually on clean frame
-            for layer_name in ["PAINTER", "PAINTER_ALT"]:
-                layer = self.canvas.layers[layer_name]
-                mask = layer[:, :, 3] > 0
-                clean_frame[mask] = layer[mask, :3]
-            
-            self._show_on_label(self.audience_win.label, clean_frame)
+        frame = cv2.flip(capture, 1, dst=self.pool.get("operator", capture.shape))
 
-        hands = self.vision.process_frame(frame)
+        if self.replayer:
+            hands = replay_hands
+        else:
+            if self.vision and self.vision.tool != self.current_tool:
+                self.vision.set_tool(self.current_tool) # Inference profile follows the tool
+            hands = self.vision.process_frame(frame) if self.vision else []
+        if self.trace:
+            self.trace.write(frame_time, hands)
+        self.history.update(hands, frame_time)
+        self.hud.begin_frame()
+        self.hud.set_hands(hands)
         
-        # 1. Global Slides Rendering (Operator View - 60% Opacity)
-        frame = self.present_tool.draw(frame, 
-                                       scale=self.zoom_tool.scale,
-                                       offset=self.zoom_tool.offset,
-                                       opacity=0.6)
+        # 1. Global Slides Rendering (Operator View - 60% Opacity, or the thumbnail grid)
+        if self.present_tool.overview:
+            frame = self.present_tool.draw_overview(frame)
+        else:
+            frame = self.present_tool.draw(frame, 
+                                           scale=self.zoom_tool.scale,
+                                           offset=self.zoom_tool.offset,
+                                           opacity=0.6)
         
         # 2. Gesture Analysis
         state = self.gestures.update_state(hands)
@@ -118,32 +335,100 @@ class AIModernPainter(QMainWindow):
             
             if state == "MENU_OPENED":
                 self.radial_menu.show_at(win_pos)
+                if self.publisher:
+                    self.publisher.publish_event(EVENT_MENU_OPENED, self.current_tool)
             elif state == "MENU_ACTIVE":
                 angle, dist = self.gestures.get_current_angle_and_dist((ix, iy))
                 self.radial_menu.update_state(win_pos, angle)
             elif state == "SELECTED":
                 self.radial_menu.hide()
                 if self.gestures.selected_tool:
+                    if self.gestures.selected_tool != self.current_tool:
+                        # Only MEDIA gestures drive the grid: don't leave it over another tool
+                        self.present_tool.overview = False
+                        self.present_tool.hover_idx = None
                     self.current_tool = self.gestures.selected_tool
                     print(f"Tool Switched to: {self.current_tool}")
+                    if self.publisher:
+                        self.publisher.publish_event(EVENT_TOOL_SWITCHED, self.current_tool)
             elif state == "IDLE":
                 frame = self._handle_tool_logic(frame, hand)
+        if not (hands and state == "IDLE"):
+            self.canvas.end_stroke() # Hand lost or gesture took over: commit the pending span
         
         # 3. Localized Clearing (Only in Painter modes, clears specific layer)
         if hands and hands[0]['fingers'] == [0, 1, 1, 1, 1]:
             if self.current_tool in ["PAINTER", "PAINTER_ALT"]:
                 self.canvas.clear_layer(self.current_tool)
+                if self.publisher:
+                    self.publisher.publish_event(EVENT_LAYER_CLEARED, self.current_tool)
+        
+        if self.publisher:
+            self.publisher.publish_frame(hands, self.current_tool, state, self.gestures.menu_active, frame_time)
+
+        # 4. Audience Snapshot (rendered on its own thread, at its own rate)
+        if self.audience and self.audience.due():
+            self.audience.submit(capture, frame_time, self.canvas, self.zoom_tool.scale, self.zoom_tool.offset)
 
         # UI Rendering
+        if self.export_status and (self.exporter.busy or time.time() < self.export_status_until):
+            self.hud.set_status(self.export_status, (50, 50), (0, 242, 254), slot="status_export")
+        self.hud.commit()
+        if self.operator_recorder:
+            self.operator_recorder.submit(frame.copy(), frame_time) # The operator buffer is reused
         self._show_on_label(self.video_label, frame)
+        
+        if self.governor and self.governor.update((time.perf_counter() - tick_start) * 1000):
+            self._apply_quality()
+        if self.alloc_monitor:
+            self.alloc_monitor.end(self.pool)
+
+    def _apply_quality(self):
+        settings = self.governor.settings
+        smooth = settings["smooth_scaling"] and self.host_profile.get("smooth_scaling", True)
+        self.scale_mode = Qt.SmoothTransformation if smooth else Qt.FastTransformation
+        if self.vision:
+            self.vision.inference_scale = min(settings["inference_scale"], self.host_profile.get("inference_scale", 1.0))
+            self.vision.inference_interval = settings["inference_interval"]
+            self.vision.set_smoothing(self.use_smooth and settings["smoothing"])
+        self.hud.show_landmarks = self.show_landmarks and settings["landmarks"]
+        if self.audience:
+            self.audience.set_rate(self.audience_fps / settings["audience_interval"])
+
+    def _track_startup(self):
+        seen = [name for name, _ in self.profiler.milestones]
+        if "first frame" not in seen:
+            self.profiler.mark("first frame")
+        if self.vision is not None and "model ready" not in seen:
+            self.profiler.mark("model ready")
+        if not self.vision_loading and self.slides_ready:
+            self.profiler.report()
 
     def _show_on_label(self, label, frame):
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self.pool.get("display_rgb", frame.shape))
         h, w, ch = rgb_frame.shape
         qi = QImage(rgb_frame.data, w, h, ch * w, QImage.Format_RGB888)
         pixmap = QPixmap.fromImage(qi)
         # Scaled contents is on, but we want smooth scaling
-        label.setPixmap(pixmap.scaled(label.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation))
+        label.setPixmap(pixmap.scaled(label.size(), Qt.KeepAspectRatio, self.scale_mode))
+
+    def export_slides(self, fmt="pdf"):
+        if self.exporter.export(self.present_tool, self.canvas, self.zoom_tool.scale, self.zoom_tool.offset, fmt):
+            self._set_export_status(f"Exporting slides ({fmt.upper()})...")
+
+    def _set_export_status(self, text, hold=0.0):
+        self.export_status = text
+        self.export_status_until = time.time() + hold
+
+    def keyPressEvent(self, event):
+        if event.key() == Qt.Key_E and event.modifiers() & Qt.ControlModifier:
+            self.export_slides("png" if event.modifiers() & Qt.ShiftModifier else "pdf")
+        else:
+            super().keyPressEvent(event)
+
+    def _show_audience(self, image):
+        label = self.audience_win.label
+        label.setPixmap(QPixmap.fromImage(image).scaled(label.size(), Qt.KeepAspectRatio, self.scale_mode))
 
     def resizeEvent(self, event):
         # Lock 16:9 Aspect Ratio
@@ -154,6 +439,7 @@ class AIModernPainter(QMainWindow):
         
         self.video_label.setFixedSize(self.size())
         self.canvas.setFixedSize(self.size())
+        self.hud.setFixedSize(self.size())
         self.radial_menu.setFixedSize(self.size())
         super().resizeEvent(event)
 
@@ -164,6 +450,13 @@ class AIModernPainter(QMainWindow):
         # Consistent Drawing Condition: Index Up, Middle Down (Thumb controls thickness mode)
         drawing_gest = (fingers[1] == 1 and fingers[2] == 0)
         
+        # Stroke Eraser: Index + Middle Up, Thumb Down (whole strokes of the active layer)
+        if self.current_tool in ("PAINTER", "PAINTER_ALT") and fingers == [0, 1, 1, 0, 0]:
+            self.canvas.draw_line(x, y, False) # Ends the stroke in progress
+            self.canvas.erase_at(x, y, ERASER_THICKNESS // 2, tool_name=self.current_tool)
+            self.hud.set_cursor(x, y, ERASER_THICKNESS // 2, (255, 255, 255), "Eraser")
+            return frame
+        
         if self.current_tool == "PAINTER":
             # Cyan (BGR) 
             if fingers[0] == 0:
@@ -179,8 +472,7 @@ class AIModernPainter(QMainWindow):
             self.canvas.draw_line(x, y, is_drawing, tool_name="PAINTER", 
                                  color=(254, 242, 0, 255), thickness=self.brush_thickness)
             # Visual Feedback (Operator only)
-            cv2.circle(frame, (x, y), self.brush_thickness//2, (254, 242, 0), 2)
-            cv2.putText(frame, status, (x + 20, y), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (254, 242, 0), 1)
+            self.hud.set_cursor(x, y, self.brush_thickness//2, (254, 242, 0), status)
             
         elif self.current_tool == "PAINTER_ALT":
             # Vivid Pink Highlighter (BGR + Alpha)
@@ -198,27 +490,58 @@ class AIModernPainter(QMainWindow):
             self.canvas.draw_line(x, y, is_drawing, tool_name="PAINTER_ALT", 
                                  color=(128, 0, 255, 120), thickness=self.brush_thickness)
             # Visual Feedback (Operator only)
-            cv2.circle(frame, (x, y), self.brush_thickness//2, (128, 0, 255), 2)
-            cv2.putText(frame, status, (x + 20, y), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (128, 0, 255), 1)
+            self.hud.set_cursor(x, y, self.brush_thickness//2, (128, 0, 255), status)
         elif self.current_tool == "KEYBOARD":
             frame = self.keyboard.draw(frame, [hand])
         elif self.current_tool == "MEDIA":
             # Combined Zoom + Presentation
-            # 1. Zoom Logic
-            raw_dist, center, is_pinching, norm_dist = self.zoom_tool.get_pinch_data(hand)
-            # If adaptive is True, use normalized distance (scaled up) to maintain sensitivity
-            dist_to_use = norm_dist * 150 if self.adaptive else raw_dist
-            scale, offset = self.zoom_tool.update(dist_to_use, center, is_pinching)
-            cv2.putText(frame, f"Media Mode | Scale: {scale:.2f}x", 
-                        (50, 650), cv2.FONT_HERSHEY_DUPLEX, 0.7, (0, 242, 254), 2)
+            # 1. Zoom Logic (paused while the overview grid is up)
+            if self.present_tool.overview:
+                hover = self.present_tool.hover_idx
+                picked = hover if hover is not None else self.present_tool.current_idx
+                self.hud.set_status(f"Overview | Slide {picked + 1}/{len(self.present_tool.slides)}", (50, 700), (0, 242, 254))
+            else:
+                _, _, is_pinching, _ = self.zoom_tool.get_pinch_data(hand)
+                diff_raw, diff_norm, diff_center = self.history.pinch_delta(0)
+                # If adaptive is True, use normalized distance (scaled up) to maintain sensitivity
+                diff_dist = diff_norm * 150 if self.adaptive else diff_raw
+                scale, offset = self.zoom_tool.update(diff_dist, diff_center, is_pinching)
+                self.hud.set_status(f"Media Mode | Scale: {scale:.2f}x", (50, 650), (0, 242, 254))
             
-            # 2. Presentation Logic (Visibility + Swipe)
+            # 2. Presentation Logic (Visibility + Swipe + Overview)
             self.present_tool.update_gestures(hand)
         
         return frame
 
+    def _finish_replay(self):
+        self.timer.stop()
+        played, elapsed = self.replayer.played, self.replayer.elapsed()
+        print(f"Replay: {played} frames in {elapsed:.2f} s ({played / max(elapsed, 1e-9):.0f} fps)")
+        self.close()
+        QApplication.instance().quit() # --dual: the audience window would keep the app alive
+
     def closeEvent(self, event):
-        self.cap.release()
+        if self.cap:
+            self.cap.release()
+        if self.trace:
+            self.trace.close()
+        if self.vision:
+            self.vision.close()
+        if self.audience:
+            self.audience.stop()
+        if self.audience_win:
+            self.audience_win.close()
+        self.exporter.stop()
+        self.executor.shutdown()
+        for recorder in (self.recorder, self.operator_recorder):
+            if recorder:
+                recorder.stop()
+        if self.shm_writer:
+            self.shm_writer.close()
+        if self.stream_server:
+            self.stream_server.stop()
+        if self.publisher:
+            self.publisher.close()
         event.accept()
 
 if __name__ == "__main__":
@@ -229,14 +552,63 @@ if __name__ == "__main__":
     parser.add_argument("--adaptive", action="store_true", help="Enable distance-adaptive thresholds")
     parser.add_argument("--dual", action="store_true", help="Enable dual-window mode (Clean Audience View)")
     parser.add_argument("--kia", action="store_true", help="Enable Kinetic Intent Analysis for swipes")
+    parser.add_argument("--shm-output", metavar="NAME", help="Publish the audience feed to a shared-memory ring buffer")
+    parser.add_argument("--worker", action="store_true", help="Run hand inference in a separate process")
+    parser.add_argument("--record", metavar="PATH", help="Record the audience feed to a video file (e.g. out.mp4)")
+    parser.add_argument("--record-operator", action="store_true", help="Also record the operator view next to --record")
+    parser.add_argument("--startup-profile", action="store_true", help="Print time spent in each startup phase")
+    parser.add_argument("--budget", type=float, metavar="MS", help="Adapt quality to keep frame time under MS (e.g. 16 or 33)")
+    parser.add_argument("--serve", type=int, metavar="PORT", help="Stream the audience feed over HTTP (MJPEG + WebSocket)")
+    parser.add_argument("--serve-host", default="127.0.0.1", help="Interface for --serve (0.0.0.0 for LAN viewers)")
+    parser.add_argument("--publish", metavar="ADDR", help="Publish landmarks/gestures (udp://host:port or unix:///path)")
+    parser.add_argument("--probe-camera", action="store_true", help="Re-negotiate the camera mode instead of using the cached one")
+    parser.add_argument("--audience-fps", type=float, default=30, help="Render rate of the audience feed (window, --record, --shm-output, --serve)")
+    parser.add_argument("--finger-model", metavar="PATH", help="Classify finger states with a trained model (python -m engine.finger_classifier train)")
+    parser.add_argument("--export-dir", default="exports", help="Where Ctrl+E (PDF) / Ctrl+Shift+E (PNG) handouts are written")
+    parser.add_argument("--debug-alloc", action="store_true", help="Report full-frame allocations per tick (tracemalloc, slow)")
+    parser.add_argument("--trace", metavar="PATH", help="Save per-frame hand data to a landmark trace (python -m utils.landmark_trace PATH)")
+    parser.add_argument("--replay", metavar="PATH", help="Drive the app from a landmark trace instead of the camera and model")
+    parser.add_argument("--replay-fast", action="store_true", help="Replay as fast as possible instead of in real time")
+    parser.add_argument("--all-hands", action="store_true", help="Always track two hands (no per-tool single-hand profiles)")
+    parser.add_argument("--idle-after", type=float, default=5.0, metavar="SECONDS", help="Throttle hand inference after SECONDS without hands or motion (0: never)")
+    parser.add_argument("--calibrate", action="store_true", help="Benchmark this host headless, save the fastest setup to host_profile.json and exit")
+    parser.add_argument("--calibrate-input", metavar="VIDEO", help="Recorded video for --calibrate (default: synthetic frames)")
+    parser.add_argument("--latency-target", type=float, default=33.0, metavar="MS", help="Per-frame latency --calibrate must meet")
     args = parser.parse_args()
 
+    if args.calibrate:
+        from utils.host_profile import calibrate
+        sys.exit(0 if calibrate(target_ms=args.latency_target, input_path=args.calibrate_input) else 1)
+    host_profile = load_profile()
+
+    profiler = StartupProfiler(enabled=args.startup_profile, t0=STARTUP_T0)
+    profiler.mark("imports done")
     app = QApplication(sys.argv)
     window = AIModernPainter(show_landmarks=not args.hide_landmarks,
-                             use_gpu=args.gpu,
+                             use_gpu=args.gpu or bool(host_profile and host_profile["use_gpu"]),
                              use_smooth=args.smooth,
                              adaptive=args.adaptive,
                              dual_window=args.dual,
-                             use_kia=args.kia)
+                             use_kia=args.kia,
+                             shm_output=args.shm_output,
+                             use_worker=args.worker,
+                             record_path=args.record,
+                             record_operator=args.record_operator,
+                             profiler=profiler,
+                             budget_ms=args.budget,
+                             serve_port=args.serve,
+                             serve_host=args.serve_host,
+                             publish_address=args.publish,
+                             probe_camera=args.probe_camera,
+                             audience_fps=args.audience_fps,
+                             finger_model=args.finger_model,
+                             export_dir=args.export_dir,
+                             debug_alloc=args.debug_alloc,
+                             idle_after=args.idle_after,
+                             tool_profiles=not args.all_hands,
+                             trace_path=args.trace,
+                             replay_path=args.replay,
+                             replay_fast=args.replay_fast,
+                             host_profile=host_profile)
     window.show()
     sys.exit(app.exec())
@@ -0,0 +1,174 @@
+import threading
+import time
+import cv2
+import numpy as np
+from PySide6.QtCore import QObject, Signal
+from PySide6.QtGui import QImage
+
+from ui.overlay_canvas import draw_preview
+from utils.buffer_pool import BufferPool
+
+class AudienceSnapshot:
+    """
+    Everything the audience view needs for one frame. Built by the operator loop,
+    never modified afterwards.
+    """
+    __slots__ = ("frame", "timestamp", "slide", "scale", "offset", "layers", "preview")
+
+    def __init__(self, frame, timestamp, slide, scale, offset, layers, preview):
+        self.frame = frame        # Raw (unflipped) camera frame, owned by the renderer
+        self.timestamp = timestamp
+        self.slide = slide
+        self.scale = scale
+        self.offset = offset
+        self.layers = layers      # Tuple of (ink color, ink mask) pairs (private copies, shared between snapshots)
+        self.preview = preview
+
+class AudienceRenderer(QObject):
+    """
+    Composes the clean audience feed on its own thread at its own rate.
+    The operator loop only calls due() / submit(); composition, slide blending and
+    delivery to the recorder, shared memory, stream server and audience window
+    happen here, capped at `fps` and only when a new snapshot arrived.
+    """
+    frame_ready = Signal(QImage)
+
+    def __init__(self, present_tool, fps=30, recorder=None, shm_writer=None, stream_server=None, window=False):
+        super().__init__()
+        self.present_tool = present_tool
+        self.recorder = recorder
+        self.shm_writer = shm_writer
+        self.stream_server = stream_server
+        self.window = window
+        self.set_rate(fps)
+
+        # Ink layers are copied only when OverlayCanvas.version moves
+        self.ink_version = -1
+        self.ink = None
+
+        # Snapshot buffers are handed over, not rotated: a frame goes back on the free
+        # list once rendered or replaced, an ink set once no snapshot refers to it.
+        # Nothing the render thread reads is ever rewritten underneath it
+        self.free_frames = []
+        self.free_ink = []   # Retired ink sets, reusable when not in a live snapshot
+        self.pool = BufferPool() # Render side (this thread)
+
+        self.cond = threading.Condition()
+        self.snapshot = None
+        self.rendering = None
+        self.last_submit = 0.0
+        self.rendered = 0
+        self.render_ms = 0.0
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="AudienceRenderer", daemon=True)
+        self.thread.start()
+
+    def set_rate(self, fps):
+        self.fps = fps
+        self.interval = 1.0 / fps
+
+    def due(self):
+        """
+        Cheap check for the operator loop: is a new snapshot wanted yet?
+        """
+        return time.perf_counter() - self.last_submit >= self.interval
+
+    def submit(self, frame, timestamp, canvas, scale, offset):
+        """
+        Hands over the latest state. Call only when due(); the frame (the raw capture,
+        not the operator frame) is copied into a buffer the renderer owns, so the
+        caller may reuse it right away.
+        """
+        self.last_submit = time.perf_counter()
+        if canvas.version != self.ink_version:
+            # Split into color + alpha mask, into an ink set no live snapshot holds
+            layers = list(canvas.layers.values())
+            reuse = self._take_ink(layers)
+            ink = []
+            for i, layer in enumerate(layers):
+                color = cv2.cvtColor(layer, cv2.COLOR_RGBA2RGB, dst=reuse[i][0] if reuse else None)
+                mask = cv2.extractChannel(layer, 3, dst=reuse[i][1] if reuse else None)
+                ink.append((color, mask))
+            with self.cond:
+                if self.ink is not None: self.free_ink.append(self.ink)
+            self.ink = tuple(ink)
+            self.ink_version = canvas.version
+        snapshot = AudienceSnapshot(self._take_frame(frame), timestamp, self.present_tool.current_slide(),
+                                    scale, (float(offset[0]), float(offset[1])),
+                                    self.ink, canvas.snapshot_preview())
+        with self.cond:
+            if self.snapshot is not None:
+                self.free_frames.append(self.snapshot.frame) # Older unrendered snapshot is simply replaced
+            self.snapshot = snapshot
+            self.cond.notify()
+
+    def _take_frame(self, frame):
+        with self.cond:
+            buf = self.free_frames.pop() if self.free_frames else None
+        if buf is None or buf.shape != frame.shape:
+            buf = np.empty_like(frame) # At most three live: pending, rendering, being filled
+        np.copyto(buf, frame)
+        return buf
+
+    def _take_ink(self, layers):
+        # A retired ink set that neither the pending nor the rendering snapshot refers to
+        with self.cond:
+            live = [s.layers for s in (self.snapshot, self.rendering) if s is not None]
+            for i, ink in enumerate(self.free_ink):
+                if any(ink is l for l in live): continue
+                del self.free_ink[i]
+                if len(ink) == len(layers) and all(c.shape[:2] == l.shape[:2] for (c, _), l in zip(ink, layers)):
+                    return ink
+                return None # Canvas resized or layers changed: let it go, allocate fresh
+        return None
+
+    def _run(self):
+        while True:
+            with self.cond:
+                self.cond.wait_for(lambda: self.snapshot is not None or not self.running)
+                if not self.running: return
+                snapshot, self.snapshot = self.snapshot, None
+                self.rendering = snapshot
+            start = time.perf_counter()
+            clean_frame = self.compose(snapshot)
+            self._deliver(clean_frame, snapshot.timestamp)
+            with self.cond:
+                self.rendering = None
+                self.free_frames.append(snapshot.frame)
+            self.render_ms = (time.perf_counter() - start) * 1000
+            self.rendered += 1
+
+    def compose(self, snapshot):
+        # Clean + 100% slide opacity. The recorder and stream server keep the frames
+        # they are given, so those need a fresh one; otherwise one buffer is reused
+        shape = snapshot.frame.shape
+        retained = self.recorder is not None or self.stream_server is not None
+        clean_frame = cv2.flip(snapshot.frame, 1, dst=None if retained else self.pool.get("clean", shape))
+        clean_frame = self.present_tool.draw_slide(clean_frame, snapshot.slide,
+                                                   scale=snapshot.scale,
+                                                   offset=snapshot.offset,
+                                                   opacity=1.0)
+        # Overlay drawings manually on clean frame
+        for color, mask in snapshot.layers:
+            cv2.copyTo(color, mask, dst=clean_frame)
+        return draw_preview(clean_frame, snapshot.preview)
+
+    def _deliver(self, clean_frame, timestamp):
+        if self.recorder:
+            self.recorder.submit(clean_frame, timestamp)
+        if self.shm_writer:
+            self.shm_writer.write(clean_frame)
+        if self.stream_server:
+            self.stream_server.publish(clean_frame)
+        if self.window:
+            # The QImage crosses to the GUI thread with no bound on when it is drawn:
+            # it gets its own pixels, the conversion buffer is reused next frame
+            rgb = cv2.cvtColor(clean_frame, cv2.COLOR_BGR2RGB, dst=self.pool.get("rgb", clean_frame.shape))
+            h, w, ch = rgb.shape
+            self.frame_ready.emit(QImage(rgb.data, w, h, ch * w, QImage.Format_RGB888).copy())
+
+    def stop(self):
+        with self.cond:
+            self.running = False
+            self.cond.notify()
+        self.thread.join(timeout=1.0)
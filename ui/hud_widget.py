@@ -0,0 +1,130 @@
+from PySide6.QtWidgets import QWidget
+from PySide6.QtCore import Qt, QPointF, QRectF
+from PySide6.QtGui import QPainter, QPainterPath, QColor, QPen, QFont, QFontMetricsF, QTransform
+from utils.theme import SCREEN_SIZE
+
+HAND_CONNECTIONS = [
+    (0, 1), (1, 2), (2, 3), (3, 4),
+    (0, 5), (5, 6), (6, 7), (7, 8),
+    (5, 9), (9, 10), (10, 11), (11, 12),
+    (9, 13), (13, 14), (14, 15), (15, 16),
+    (13, 17), (17, 18), (18, 19), (19, 20),
+    (0, 17)
+]
+
+def _bgr(color):
+    return QColor(color[2], color[1], color[0])
+
+class HudWidget(QWidget):
+    """
+    Retained-mode operator overlay (landmarks, brush cursor, status text).
+    Content is described in internal SCREEN_SIZE coordinates once per frame
+    between begin_frame() and commit(); only changed regions are repainted.
+    """
+    def __init__(self, parent=None, show_landmarks=True):
+        super().__init__(parent)
+        self.setAttribute(Qt.WA_TranslucentBackground)
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.show_landmarks = show_landmarks
+
+        self.font = QFont("Sans Serif", 11)
+        self.status_font = QFont("Sans Serif", 14, QFont.Bold)
+
+        # Committed state (what is on screen) and pending state (being built)
+        self.items = {}
+        self.pending = {}
+
+    def begin_frame(self):
+        self.pending = {}
+
+    def set_hands(self, hands):
+        if not self.show_landmarks or not hands: return
+        skeleton = QPainterPath()
+        joints = QPainterPath()
+        for hand in hands:
+            lms = hand['landmarks']
+            for start, end in HAND_CONNECTIONS:
+                skeleton.moveTo(lms[start][0], lms[start][1])
+                skeleton.lineTo(lms[end][0], lms[end][1])
+            for lm in lms:
+                joints.addEllipse(QPointF(lm[0], lm[1]), 5, 5)
+        key = tuple((lm[0], lm[1]) for hand in hands for lm in hand['landmarks'])
+        self.pending["hands"] = (key, skeleton, joints)
+
+    def set_cursor(self, x, y, radius, color, text=""):
+        """
+        Brush cursor ring with a label. `color` is BGR like the drawing layers.
+        """
+        self.pending["cursor"] = ((x, y, radius, tuple(color), text),)
+
+    def set_status(self, text, pos=(50, 650), color=(0, 242, 254), slot="status"):
+        """
+        Status line. Lines in different slots (names starting with "status") coexist.
+        """
+        self.pending[slot] = ((text, pos, tuple(color)),)
+
+    def commit(self):
+        """
+        Swaps in the pending frame and invalidates only regions that changed.
+        """
+        dirty = QRectF()
+        for name in set(self.items) | set(self.pending):
+            old, new = self.items.get(name), self.pending.get(name)
+            if old is not None and new is not None and old[0] == new[0]: continue
+            if old is not None: dirty = dirty.united(self._bounds(name, old))
+            if new is not None: dirty = dirty.united(self._bounds(name, new))
+        self.items = self.pending
+        self.pending = {}
+
+        if not dirty.isEmpty():
+            self.update(self._to_widget().mapRect(dirty).toAlignedRect().adjusted(-2, -2, 2, 2))
+
+    def _bounds(self, name, item):
+        if name == "hands":
+            _, skeleton, joints = item
+            return skeleton.boundingRect().united(joints.boundingRect()).adjusted(-3, -3, 3, 3)
+        if name == "cursor":
+            x, y, radius, _, text = item[0]
+            text_w = QFontMetricsF(self.font).horizontalAdvance(text)
+            reach = max(radius, 20 + text_w)
+            half_h = max(radius, 20)
+            return QRectF(x - radius - 2, y - half_h - 2, radius + reach + 4, 2 * half_h + 4)
+        if name.startswith("status"):
+            text, (x, y), _ = item[0]
+            metrics = QFontMetricsF(self.status_font)
+            return QRectF(x, y - metrics.ascent(), metrics.horizontalAdvance(text), metrics.height())
+        return QRectF()
+
+    def _to_widget(self):
+        return QTransform.fromScale(self.width() / SCREEN_SIZE[0], self.height() / SCREEN_SIZE[1])
+
+    def paintEvent(self, event):
+        if not self.items: return
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setTransform(self._to_widget())
+
+        if "hands" in self.items:
+            _, skeleton, joints = self.items["hands"]
+            painter.setPen(QPen(QColor(0, 255, 0), 2))
+            painter.setBrush(Qt.NoBrush)
+            painter.drawPath(skeleton)
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QColor(255, 0, 255))
+            painter.drawPath(joints)
+
+        if "cursor" in self.items:
+            x, y, radius, color, text = self.items["cursor"][0]
+            painter.setPen(QPen(_bgr(color), 2))
+            painter.setBrush(Qt.NoBrush)
+            painter.drawEllipse(QPointF(x, y), radius, radius)
+            if text:
+                painter.setFont(self.font)
+                painter.drawText(QPointF(x + 20, y), text)
+
+        painter.setFont(self.status_font)
+        for name, item in self.items.items():
+            if not name.startswith("status"): continue
+            text, (x, y), color = item[0]
+            painter.setPen(_bgr(color))
+            painter.drawText(QPointF(x, y), text)
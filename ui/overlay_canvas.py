@@ -1,12 +1,42 @@
+import time
 import cv2
 import numpy as np
 from PySide6.QtWidgets import QWidget
-from PySide6.QtCore import Qt, QPoint
-from PySide6.QtGui import QPainter, QImage, QPixmap
+from PySide6.QtCore import Qt, QPoint, QPointF, QRect
+from PySide6.QtGui import QPainter, QImage, QPixmap, QPen, QColor, QPolygonF
 from utils.theme import SCREEN_SIZE
+from ui.stroke_index import Stroke, StrokeGrid, hit_strokes
+
+def draw_preview(img, preview):
+    """
+    Paints a provisional stroke (OverlayCanvas.snapshot_preview()) onto a BGR frame.
+    """
+    if preview is None: return img
+    pts, color, thickness = preview
+    cv2.polylines(img, [np.round(pts).astype(np.int32)], False, color[:3], thickness)
+    return img
+
+def catmull_rom(p0, p1, p2, p3, steps):
+    """
+    Points on the Catmull-Rom segment p1 -> p2 (inclusive), shape [steps + 1, 2].
+    """
+    t = np.linspace(0.0, 1.0, steps + 1)[:, None]
+    t2, t3 = t * t, t * t * t
+    return 0.5 * ((2 * p1) + (p2 - p0) * t +
+                  (2 * p0 - 5 * p1 + 4 * p2 - p3) * t2 +
+                  (3 * p1 - p0 - 3 * p2 + p3) * t3)
 
 class OverlayCanvas(QWidget):
-    def __init__(self, parent=None):
+    """
+    Persistent ink layers for the painter tools.
+    Strokes are Catmull-Rom splines through the fingertip samples. A segment is
+    committed to the layer once the sample after it is known (that fixes its end
+    tangent); the span up to the newest sample plus a short extrapolation ahead of
+    it is only a provisional preview, painted on top and never rasterized.
+    Committed spans are also kept per stroke in a StrokeGrid, so erase_at() can
+    find and remove whole strokes and re-rasterize only the region they covered.
+    """
+    def __init__(self, parent=None, predict_ms=60):
         super().__init__(parent)
         self.setAttribute(Qt.WA_TranslucentBackground)
         
@@ -16,29 +46,196 @@ class OverlayCanvas(QWidget):
             "PAINTER_ALT": np.zeros((SCREEN_SIZE[1], SCREEN_SIZE[0], 4), dtype=np.uint8)
         }
         
-        self.xp, self.yp = 0, 0
         self.thickness = 10
+        self.predict_ms = predict_ms # How far ahead of the last sample the preview reaches
+        self.stroke_gap = 0.25       # Seconds without samples that end a stroke
+
+        # Current stroke
+        self.samples = []            # Last 4 fingertip samples: (np.array([x, y]), t)
+        self.stroke_tool = None
+        self.stroke_color = None
+        self.stroke_thickness = self.thickness
+        self.preview = None          # float32 [n, 2] provisional polyline (layer coords)
+        self.version = 0             # Bumped whenever committed ink changes
+
+        # Stroke records for the eraser
+        self.strokes = {}            # id -> Stroke, ids grow with drawing order
+        self.grid = StrokeGrid()
+        self.next_stroke_id = 0
+        self.current_stroke = None
+        self.scratch = None          # Layer-sized buffer for re-rasterizing erased regions
 
     def draw_line(self, x, y, is_drawing, tool_name="PAINTER", color=(254, 242, 0, 255), thickness=None):
         """
-        Draws onto the specified tool's layer.
-        """
-        if is_drawing:
-            if self.xp == 0 and self.yp == 0:
-                self.xp, self.yp = x, y
-            
-            target_layer = self.layers.get(tool_name, self.layers["PAINTER"])
-            draw_thickness = thickness if thickness is not None else self.thickness
-            cv2.line(target_layer, (self.xp, self.yp), (x, y), color, draw_thickness)
-            
-            self.xp, self.yp = x, y
-            self.update()
-        else:
-            self.xp, self.yp = 0, 0
+        Feeds a fingertip sample into the current stroke of the specified tool's layer.
+        """
+        if not is_drawing:
+            self.end_stroke()
+            return
+
+        now = time.time()
+        point = np.array([x, y], dtype=np.float32)
+        if self.samples:
+            last_point, last_time = self.samples[-1]
+            if tool_name != self.stroke_tool or now - last_time > self.stroke_gap:
+                self.end_stroke()
+            elif np.abs(point - last_point).max() < 1:
+                return # Same landmarks as last frame (inference skipped): nothing new
+
+        if not self.samples:
+            self.stroke_tool = tool_name if tool_name in self.layers else "PAINTER"
+            self.stroke_color = color
+            self.stroke_thickness = thickness if thickness is not None else self.thickness
+            self.current_stroke = Stroke(self.next_stroke_id, self.stroke_tool, self.stroke_color, self.stroke_thickness)
+            self.strokes[self.current_stroke.id] = self.current_stroke
+            self.next_stroke_id += 1
+        self.samples.append((point, now))
+        del self.samples[:-4]
+
+        dirty = [self._preview_bounds()]
+        if len(self.samples) == 1:
+            # A tap leaves a dot
+            dirty.append(self._rasterize(point[None, :]))
+        elif len(self.samples) >= 3:
+            # The previous segment's end tangent is now known: commit it
+            pts = [p for p, _ in self.samples]
+            p0 = pts[-4] if len(pts) == 4 else pts[-3]
+            dirty.append(self._rasterize(self._segment(p0, pts[-3], pts[-2], pts[-1])))
+        self.preview = self._build_preview()
+        dirty.append(self._preview_bounds())
+        self._invalidate(dirty)
+
+    def end_stroke(self):
+        """
+        Commits the span still shown as preview and forgets the stroke.
+        """
+        if not self.samples: return
+        dirty = [self._preview_bounds()]
+        if len(self.samples) >= 2:
+            pts = [p for p, _ in self.samples]
+            p0 = pts[-3] if len(pts) >= 3 else pts[-2]
+            dirty.append(self._rasterize(self._segment(p0, pts[-2], pts[-1], pts[-1])))
+        self.samples = []
+        self.preview = None
+        self.current_stroke = None
+        self._invalidate(dirty)
+
+    def _segment(self, p0, p1, p2, p3):
+        steps = int(np.clip(np.linalg.norm(p2 - p1) / 4, 1, 32))
+        return catmull_rom(p0, p1, p2, p3, steps)
+
+    def _build_preview(self):
+        """
+        Spline from the last committed point to the newest sample, then a
+        velocity extrapolation covering roughly predict_ms of pipeline latency.
+        """
+        (last, t_last) = self.samples[-1]
+        if len(self.samples) == 1: return None
+        prev, t_prev = self.samples[-2]
+        velocity = (last - prev) / max(t_last - t_prev, 1e-3)
+        lead = velocity * (self.predict_ms / 1000)
+        # Never run further ahead than the last real step or a few brush widths
+        max_lead = min(np.linalg.norm(last - prev), 4 * self.stroke_thickness + 20)
+        norm = np.linalg.norm(lead)
+        if norm > max_lead: lead *= max_lead / norm
+        ahead = last + lead
+
+        pts = [p for p, _ in self.samples]
+        p0 = pts[-3] if len(pts) >= 3 else prev
+        return np.vstack([self._segment(p0, prev, last, ahead),
+                          self._segment(prev, last, ahead, ahead)[1:]]).astype(np.float32)
+
+    def _rasterize(self, pts):
+        """
+        Draws only the given span onto the stroke's layer. Returns its bounds.
+        """
+        layer = self.layers[self.stroke_tool]
+        span = np.round(pts).astype(np.int32)
+        # polylines skips a lone point: a dot is a zero-length segment (also for the eraser's redraw)
+        if len(span) == 1: span = np.repeat(span, 2, axis=0)
+        cv2.polylines(layer, [span], False, self.stroke_color, self.stroke_thickness)
+        if self.current_stroke is not None:
+            self.current_stroke.add_span(span)
+            self.grid.insert_span(self.current_stroke, span)
+        self.version += 1
+        return self._bounds(pts)
+
+    def _bounds(self, pts):
+        if pts is None or len(pts) == 0: return None
+        pad = self.stroke_thickness // 2 + 2
+        x0, y0 = np.floor(pts.min(axis=0)).astype(int) - pad
+        x1, y1 = np.ceil(pts.max(axis=0)).astype(int) + pad
+        return x0, y0, x1, y1
+
+    def _preview_bounds(self):
+        return self._bounds(self.preview)
+
+    def _invalidate(self, boxes):
+        # Repaint only the area that changed, mapped from layer to widget coordinates
+        boxes = [b for b in boxes if b is not None]
+        if not boxes: return
+        x0, y0 = min(b[0] for b in boxes), min(b[1] for b in boxes)
+        x1, y1 = max(b[2] for b in boxes), max(b[3] for b in boxes)
+        sx, sy = self.width() / SCREEN_SIZE[0], self.height() / SCREEN_SIZE[1]
+        self.update(QRect(int(x0 * sx) - 1, int(y0 * sy) - 1,
+                          int((x1 - x0) * sx) + 3, int((y1 - y0) * sy) + 3))
+
+    def snapshot_preview(self):
+        """
+        Immutable view of the provisional stroke for other threads (preview arrays are replaced, never edited).
+        """
+        if self.preview is None: return None
+        return self.preview, self.stroke_color, self.stroke_thickness
+
+    def erase_at(self, x, y, radius, tool_name="PAINTER"):
+        """
+        Deletes every stroke of the tool's layer passing within `radius` of (x, y).
+        Only the erased strokes' area is cleared and redrawn from the strokes still
+        overlapping it, in drawing order. Returns the number of strokes removed.
+        """
+        if tool_name not in self.layers: return 0
+        # 1. Candidates from the grid cells around the eraser
+        candidates = [self.strokes[i] for i in self.grid.query(x - radius, y - radius, x + radius, y + radius)]
+        hits = hit_strokes([s for s in candidates if s.tool == tool_name and s is not self.current_stroke], x, y, radius)
+        if not hits: return 0
+
+        # 2. Forget them, growing the dirty region
+        x0, y0 = min(s.bounds[0] for s in hits), min(s.bounds[1] for s in hits)
+        x1, y1 = max(s.bounds[2] for s in hits), max(s.bounds[3] for s in hits)
+        for stroke in hits:
+            self.grid.remove(stroke)
+            del self.strokes[stroke.id]
+
+        # 3. Re-rasterize the region from the remaining strokes
+        layer = self.layers[tool_name]
+        h, w = layer.shape[:2]
+        x0, y0, x1, y1 = max(x0, 0), max(y0, 0), min(x1, w - 1), min(y1, h - 1)
+        if x0 <= x1 and y0 <= y1:
+            # Drawn at full layer size: OpenCV's thick-line rasterization shifts when
+            # a line is clipped, so drawing into a cropped view would not match the ink
+            if self.scratch is None: self.scratch = np.zeros_like(layer)
+            region = (slice(y0, y1 + 1), slice(x0, x1 + 1))
+            self.scratch[region] = 0
+            for stroke_id in sorted(self.grid.query(x0, y0, x1, y1)):
+                stroke = self.strokes[stroke_id]
+                if stroke.tool != tool_name: continue
+                cv2.polylines(self.scratch, stroke.spans, False, stroke.color, stroke.thickness)
+            layer[region] = self.scratch[region]
+        self.version += 1
+        self._invalidate([(x0, y0, x1, y1)])
+        return len(hits)
 
     def clear_layer(self, tool_name):
         if tool_name in self.layers:
+            if tool_name == self.stroke_tool:
+                self.samples = []
+                self.preview = None
+                self.current_stroke = None
+            for stroke in [s for s in self.strokes.values() if s.tool == tool_name]:
+                self.grid.remove(stroke)
+                del self.strokes[stroke.id]
             self.layers[tool_name].fill(0)
+            self.version += 1
             self.update()
 
     def paintEvent(self, event):
@@ -51,3 +248,13 @@ class OverlayCanvas(QWidget):
             qi = QImage(layer.data, w, h, w * 4, QImage.Format_RGBA8888)
             # Scale the fixed-size layer to the current widget size
             painter.drawImage(self.rect(), qi)
+
+        # Provisional stroke on top
+        if self.preview is not None:
+            sx, sy = self.width() / w, self.height() / h
+            # Same channel order as the RGBA layers above, so preview and ink match
+            pen = QPen(QColor(*self.stroke_color), max(1.0, self.stroke_thickness * sx))
+            pen.setCapStyle(Qt.RoundCap)
+            pen.setJoinStyle(Qt.RoundJoin)
+            painter.setPen(pen)
+            painter.drawPolyline(QPolygonF([QPointF(x * sx, y * sy) for x, y in self.preview]))
@@ -0,0 +1,101 @@
+from collections import defaultdict
+import numpy as np
+
+class Stroke:
+    """
+    One committed stroke: the rasterized spans (int32 polylines) and how they were drawn.
+    """
+    __slots__ = ("id", "tool", "color", "thickness", "spans", "cells", "bounds")
+
+    def __init__(self, stroke_id, tool, color, thickness):
+        self.id = stroke_id
+        self.tool = tool
+        self.color = color
+        self.thickness = thickness
+        self.spans = []
+        self.cells = set()
+        self.bounds = None # x0, y0, x1, y1 including the brush radius
+
+    def add_span(self, pts):
+        self.spans.append(pts)
+        pad = self.thickness // 2 + 2
+        x0, y0 = pts.min(axis=0) - pad
+        x1, y1 = pts.max(axis=0) + pad
+        if self.bounds is not None:
+            bx0, by0, bx1, by1 = self.bounds
+            x0, y0, x1, y1 = min(x0, bx0), min(y0, by0), max(x1, bx1), max(y1, by1)
+        self.bounds = (int(x0), int(y0), int(x1), int(y1))
+
+    def segments(self):
+        """
+        Centerline as segment endpoints (a[m, 2], b[m, 2]), a dot being a zero-length segment.
+        """
+        a = np.concatenate([pts[:-1] if len(pts) > 1 else pts for pts in self.spans])
+        b = np.concatenate([pts[1:] if len(pts) > 1 else pts for pts in self.spans])
+        return a, b
+
+def hit_strokes(strokes, x, y, radius):
+    """
+    Strokes whose ink passes within `radius` of (x, y); one vectorized
+    point-to-segment distance pass over all of their segments.
+    """
+    if not strokes: return []
+    parts = [stroke.segments() for stroke in strokes]
+    counts = np.array([len(a) for a, _ in parts])
+    a = np.concatenate([a for a, _ in parts]).astype(np.float32)
+    b = np.concatenate([b for _, b in parts]).astype(np.float32)
+    p = np.array([x, y], dtype=np.float32)
+    ab = b - a
+    t = np.clip(((p - a) * ab).sum(axis=1) / np.maximum((ab * ab).sum(axis=1), 1e-6), 0, 1)
+    dist = np.hypot(*(a + ab * t[:, None] - p).T)
+    nearest = np.minimum.reduceat(dist, np.concatenate([[0], np.cumsum(counts)[:-1]]))
+    reach = radius + np.array([stroke.thickness for stroke in strokes]) / 2
+    return [stroke for stroke, hit in zip(strokes, nearest <= reach) if hit]
+
+class StrokeGrid:
+    """
+    Uniform grid over layer pixels: each cell lists the strokes with a segment
+    (plus brush radius) touching it, so a hit test or a redraw only looks at
+    strokes near the query rectangle instead of all of them.
+    """
+    def __init__(self, cell=32):
+        self.cell = cell
+        self.cells = defaultdict(set)
+
+    def _cell_range(self, x0, y0, x1, y1):
+        c = self.cell
+        return range(int(x0) // c, int(x1) // c + 1), range(int(y0) // c, int(y1) // c + 1)
+
+    def insert_span(self, stroke, pts):
+        pad = stroke.thickness // 2 + 2
+        a = pts if len(pts) == 1 else pts[:-1]
+        b = pts if len(pts) == 1 else pts[1:]
+        lo = (np.minimum(a, b) - pad) // self.cell
+        hi = (np.maximum(a, b) + pad) // self.cell
+        for (cx0, cy0), (cx1, cy1) in zip(lo.tolist(), hi.tolist()):
+            for cx in range(cx0, cx1 + 1):
+                for cy in range(cy0, cy1 + 1):
+                    key = (cx, cy)
+                    if key not in stroke.cells:
+                        stroke.cells.add(key)
+                        self.cells[key].add(stroke.id)
+
+    def remove(self, stroke):
+        for key in stroke.cells:
+            ids = self.cells.get(key)
+            if ids is None: continue
+            ids.discard(stroke.id)
+            if not ids: del self.cells[key]
+        stroke.cells = set()
+
+    def query(self, x0, y0, x1, y1):
+        """
+        Ids of strokes that may touch the rectangle.
+        """
+        found = set()
+        xs, ys = self._cell_range(x0, y0, x1, y1)
+        for cx in xs:
+            for cy in ys:
+                ids = self.cells.get((cx, cy))
+                if ids: found |= ids
+        return found
@@ -0,0 +1,74 @@
+import time
+import tracemalloc
+import numpy as np
+
+class BufferPool:
+    """
+    Reusable arrays keyed by name, for `dst=` arguments in the per-frame hot path.
+    A buffer is reallocated only when the requested shape or dtype changes.
+    Not thread-safe: give each thread its own pool.
+    """
+    def __init__(self):
+        self.buffers = {}
+        self.rings = {}
+        self.allocations = 0
+
+    def get(self, key, shape, dtype=np.uint8):
+        buf = self.buffers.get(key)
+        if buf is None or buf.shape != tuple(shape) or buf.dtype != dtype:
+            buf = np.empty(shape, dtype=dtype)
+            self.buffers[key] = buf
+            self.allocations += 1
+        return buf
+
+    def ring(self, key, shape, depth=3, dtype=np.uint8):
+        """
+        Next buffer of a rotating set, for frames handed to another thread: a buffer
+        is only reused `depth` calls later, after the consumer has moved on.
+        """
+        entry = self.rings.get(key)
+        if entry is None or entry[0][0].shape != tuple(shape) or entry[0][0].dtype != dtype:
+            entry = [[np.empty(shape, dtype=dtype) for _ in range(depth)], 0]
+            self.rings[key] = entry
+            self.allocations += depth
+        buffers, idx = entry
+        entry[1] = (idx + 1) % len(buffers)
+        return buffers[idx]
+
+    def nbytes(self):
+        return (sum(b.nbytes for b in self.buffers.values()) +
+                sum(b.nbytes for bufs, _ in self.rings.values() for b in bufs))
+
+class AllocationMonitor:
+    """
+    Debug aid: proves the hot loop is allocation-free. Uses tracemalloc (NumPy reports
+    its data buffers to it) to find the transient peak of each tick; a peak of one
+    frame or more means a full frame was allocated. Other threads are counted too.
+    """
+    def __init__(self, frame_bytes, report_interval=5.0):
+        self.frame_bytes = frame_bytes
+        self.report_interval = report_interval
+        self.ticks = 0
+        self.frame_ticks = 0   # Ticks that allocated at least one full frame
+        self.max_transient = 0
+        self.last_report = time.time()
+        self.base = 0
+        if not tracemalloc.is_tracing(): tracemalloc.start()
+
+    def begin(self):
+        tracemalloc.reset_peak()
+        self.base = tracemalloc.get_traced_memory()[0]
+
+    def end(self, pool=None):
+        _, peak = tracemalloc.get_traced_memory()
+        transient = peak - self.base
+        self.ticks += 1
+        if transient >= self.frame_bytes: self.frame_ticks += 1
+        self.max_transient = max(self.max_transient, transient)
+
+        if time.time() - self.last_report >= self.report_interval:
+            pooled = f", pool {pool.allocations} allocs / {pool.nbytes() / 1e6:.1f} MB" if pool else ""
+            print(f"AllocationMonitor: {self.frame_ticks}/{self.ticks} ticks allocated a full frame, "
+                  f"max transient {self.max_transient / 1e6:.2f} MB{pooled}")
+            self.ticks = self.frame_ticks = self.max_transient = 0
+            self.last_report = time.time()
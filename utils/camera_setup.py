@@ -0,0 +1,167 @@
+import json
+import os
+import threading
+import time
+import cv2
+import numpy as np
+
+from utils.theme import SCREEN_SIZE
+
+CACHE_PATH = "camera_modes.json"
+FOURCCS = ["MJPG", "YUYV"]   # MJPG first: compressed, so USB 2.0 can carry 720p60
+FRAME_RATES = [60, 30, 15]
+_cache_lock = threading.Lock() # StreamPool negotiates several cameras at once
+
+class CaptureMode:
+    """
+    One negotiated camera mode plus what it actually delivered when measured.
+    """
+    def __init__(self, fourcc, width, height, fps, measured_fps=0.0, jitter_ms=0.0, buffer_size=None):
+        self.fourcc = fourcc
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.measured_fps = measured_fps
+        self.jitter_ms = jitter_ms
+        self.buffer_size = buffer_size
+
+    def to_dict(self):
+        return dict(self.__dict__)
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+    def __repr__(self):
+        return (f"{self.fourcc} {self.width}x{self.height}@{self.fps} "
+                f"(measured {self.measured_fps:.1f} fps, jitter {self.jitter_ms:.1f} ms, buffer {self.buffer_size})")
+
+def _fourcc_name(value):
+    value = int(value)
+    if value <= 0: return None
+    return "".join(chr((value >> (8 * i)) & 0xFF) for i in range(4))
+
+def _device_key(cap, device):
+    try:
+        backend = cap.getBackendName()
+    except cv2.error:
+        backend = "default"
+    return f"{backend}:{device}"
+
+def apply_mode(cap, fourcc, width, height, fps):
+    """
+    Requests a mode. Order matters on V4L2: pixel format first, then size, then rate.
+    Returns the buffer size the driver accepted (None if it can't tell).
+    """
+    cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*fourcc))
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+    cap.set(cv2.CAP_PROP_FPS, fps)
+    # Smallest driver queue: every queued frame is pure added latency
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+    buffer_size = int(cap.get(cv2.CAP_PROP_BUFFERSIZE))
+    return buffer_size if buffer_size > 0 else None
+
+def measure(cap, seconds=0.6, warmup=3):
+    """
+    Reads frames for `seconds`. Returns (fps, jitter_ms, frame_shape) of what was delivered.
+    """
+    for _ in range(warmup): # Drop frames captured under the previous mode
+        cap.read()
+    stamps = []
+    shape = None
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        success, frame = cap.read()
+        if not success: break
+        stamps.append(time.perf_counter())
+        shape = frame.shape
+    if len(stamps) < 3: return 0.0, 0.0, shape
+    intervals = np.diff(stamps)
+    return 1.0 / intervals.mean(), float(intervals.std() * 1000), shape
+
+def probe_modes(cap, target=SCREEN_SIZE, seconds=0.6):
+    """
+    Tries every FOURCC / frame rate at the target resolution and measures each.
+    Returns the modes that really delivered the target size, best first.
+    """
+    width, height = target
+    modes = []
+    for fourcc in FOURCCS:
+        for fps in FRAME_RATES:
+            buffer_size = apply_mode(cap, fourcc, width, height, fps)
+            # Drivers silently fall back to another format: trust only what comes out
+            actual_fourcc = _fourcc_name(cap.get(cv2.CAP_PROP_FOURCC)) or fourcc
+            measured_fps, jitter_ms, shape = measure(cap, seconds)
+            if shape is None or shape[1] != width or shape[0] != height: continue
+            mode = CaptureMode(actual_fourcc, width, height, fps, measured_fps, jitter_ms, buffer_size)
+            print(f"CameraSetup: probed {mode}")
+            modes.append(mode)
+            # A lower requested rate won't beat what this format already delivers
+            if measured_fps >= fps * 0.9: break
+    # Highest delivered FPS; within 2 fps of each other, steadier wins
+    modes.sort(key=lambda m: (-round(m.measured_fps / 2), m.jitter_ms))
+    return modes
+
+def load_cache(path=CACHE_PATH):
+    if not os.path.exists(path): return {}
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_cache(cache, path=CACHE_PATH):
+    try:
+        with open(path, "w") as f:
+            json.dump(cache, f, indent=2)
+    except OSError as e:
+        print(f"CameraSetup: could not write {path}: {e}")
+
+def open_camera(device=0, target=SCREEN_SIZE, cache_path=CACHE_PATH, reprobe=False):
+    """
+    Opens a camera in its lowest-latency mode for the target resolution.
+    The negotiated mode is cached per device, so later launches skip probing.
+    Returns (cap, mode); mode is None if nothing delivered the target size.
+    """
+    cap = cv2.VideoCapture(device)
+    if not cap.isOpened():
+        print(f"CameraSetup: could not open camera {device}")
+        return cap, None
+    key = _device_key(cap, device)
+    cache = load_cache(cache_path) if cache_path else {}
+
+    # 1. Cached mode: apply it without measuring (keeps startup fast)
+    cached = cache.get(key)
+    if cached and not reprobe:
+        mode = CaptureMode.from_dict(cached)
+        apply_mode(cap, mode.fourcc, mode.width, mode.height, mode.fps)
+        print(f"CameraSetup: using cached mode {mode}")
+        return cap, mode
+
+    # 2. Probe and keep the best mode
+    modes = probe_modes(cap, target)
+    if not modes:
+        print(f"CameraSetup: no mode delivered {target[0]}x{target[1]}, using driver defaults")
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, target[0])
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, target[1])
+        return cap, None
+    best = modes[0]
+    apply_mode(cap, best.fourcc, best.width, best.height, best.fps)
+    print(f"CameraSetup: selected {best}")
+    if cache_path:
+        with _cache_lock:
+            cache = load_cache(cache_path) # Re-read: another device may have saved meanwhile
+            cache[key] = best.to_dict()
+            save_cache(cache, cache_path)
+    return cap, best
+
+if __name__ == "__main__":
+    # Re-negotiate and report: python -m utils.camera_setup [device]
+    import sys
+    device = int(sys.argv[1]) if len(sys.argv) > 1 and sys.argv[1].isdigit() else 0
+    cap, mode = open_camera(device, reprobe=True)
+    if mode:
+        fps, jitter, _ = measure(cap, seconds=3.0)
+        print(f"Delivered: {fps:.1f} fps, jitter {jitter:.1f} ms")
+    cap.release()
@@ -0,0 +1,218 @@
+import os
+import select
+import socket
+import struct
+import time
+import numpy as np
+
+from utils.hand_codec import TYPE_FIELD, FINGERS_FIELD, encode_type, encode_fingers
+
+MAX_HANDS = 2
+MAGIC_FRAME = b"VHF1"
+MAGIC_EVENT = b"VHE1"
+
+TOOLS = ["PAINTER", "PAINTER_ALT", "MEDIA", "KEYBOARD"]
+STATES = ["IDLE", "TRIGGERING", "MENU_OPENED", "MENU_ACTIVE", "SELECTED"]
+
+# Discrete gesture events
+EVENT_MENU_OPENED = 1
+EVENT_TOOL_SWITCHED = 2
+EVENT_LAYER_CLEARED = 3
+
+# Fixed-layout frame record: always MAX_HANDS slots, num_hands says how many are valid
+HAND_DTYPE = np.dtype([
+    TYPE_FIELD,
+    FINGERS_FIELD,
+    ("scale", np.float32),
+    ("landmarks", np.float32, (21, 3))  # Pixel x, y and relative z
+], align=True)
+FRAME_DTYPE = np.dtype([
+    ("magic", "S4"),
+    ("seq", np.uint32),
+    ("timestamp", np.float64),
+    ("num_hands", np.uint8),
+    ("tool", np.uint8),        # Index into TOOLS
+    ("state", np.uint8),       # Index into STATES
+    ("menu_active", np.uint8),
+    ("hands", HAND_DTYPE, (MAX_HANDS,))
+], align=True)
+
+EVENT_STRUCT = struct.Struct("<4sIdBB") # magic, seq, timestamp, event, tool
+
+def _parse_address(address):
+    """
+    'udp://host:port' or 'unix:///path/to.sock' -> (family, sockaddr)
+    """
+    if address.startswith("unix://"):
+        return socket.AF_UNIX, address[len("unix://"):]
+    host, port = address[len("udp://"):].rsplit(":", 1) if address.startswith("udp://") else address.rsplit(":", 1)
+    return socket.AF_INET, (host, int(port))
+
+def events_address(address):
+    """
+    Gesture events use a sibling channel: UDP port + 1, or '<path>.events'.
+    """
+    family, addr = _parse_address(address)
+    if family == socket.AF_UNIX:
+        return f"unix://{addr}.events"
+    return f"udp://{addr[0]}:{addr[1] + 1}"
+
+class EventPublisher:
+    """
+    Sends one fixed-size binary record per frame plus discrete gesture events
+    over datagram sockets. Sends are non-blocking; with no subscriber they are dropped.
+    """
+    def __init__(self, address="udp://127.0.0.1:5005"):
+        self.family, self.frame_addr = _parse_address(address)
+        _, self.event_addr = _parse_address(events_address(address))
+        self.sock = socket.socket(self.family, socket.SOCK_DGRAM)
+        self.sock.setblocking(False)
+
+        self.record = np.zeros(1, dtype=FRAME_DTYPE) # Reused every frame
+        self.record["magic"] = MAGIC_FRAME
+        self.seq = 0
+        self.event_seq = 0
+        self.send_errors = 0
+
+    def publish_frame(self, hands, tool="PAINTER", state="IDLE", menu_active=False, timestamp=None):
+        rec = self.record[0]
+        self.seq += 1
+        rec["seq"] = self.seq
+        rec["timestamp"] = timestamp if timestamp is not None else time.time()
+        n = min(len(hands), MAX_HANDS)
+        rec["num_hands"] = n
+        rec["tool"] = TOOLS.index(tool) if tool in TOOLS else 255
+        rec["state"] = STATES.index(state) if state in STATES else 255
+        rec["menu_active"] = menu_active
+
+        slots = rec["hands"]
+        for i in range(n):
+            hand = hands[i]
+            slots[i]["type"] = encode_type(hand['type'])
+            slots[i]["fingers"] = encode_fingers(hand['fingers'])
+            slots[i]["scale"] = hand.get('scale', 0)
+            slots[i]["landmarks"] = [(lm[0], lm[1], lm[2] if len(lm) > 2 else 0.0) for lm in hand['landmarks']]
+        self._send(self.record.tobytes(), self.frame_addr)
+
+    def publish_event(self, event, tool=None, timestamp=None):
+        self.event_seq += 1
+        payload = EVENT_STRUCT.pack(MAGIC_EVENT, self.event_seq,
+                                    timestamp if timestamp is not None else time.time(),
+                                    event, TOOLS.index(tool) if tool in TOOLS else 255)
+        self._send(payload, self.event_addr)
+
+    def _send(self, payload, addr):
+        try:
+            self.sock.sendto(payload, addr)
+        except (BlockingIOError, ConnectionRefusedError, FileNotFoundError, OSError):
+            self.send_errors += 1
+
+    def close(self):
+        self.sock.close()
+
+def decode_frame(data):
+    """
+    Returns the frame record (NumPy structured scalar) or None for foreign datagrams.
+    """
+    if len(data) != FRAME_DTYPE.itemsize or data[:4] != MAGIC_FRAME: return None
+    return np.frombuffer(data, dtype=FRAME_DTYPE)[0]
+
+def decode_event(data):
+    if len(data) != EVENT_STRUCT.size or data[:4] != MAGIC_EVENT: return None
+    _, seq, timestamp, event, tool = EVENT_STRUCT.unpack(data)
+    return {"seq": seq, "timestamp": timestamp, "event": event,
+            "tool": TOOLS[tool] if tool < len(TOOLS) else None}
+
+class EventSubscriber:
+    """
+    Reference subscriber: binds both channels and yields decoded records.
+    """
+    def __init__(self, address="udp://127.0.0.1:5005"):
+        self.sockets = []
+        for addr, decoder in ((address, decode_frame), (events_address(address), decode_event)):
+            family, sockaddr = _parse_address(addr)
+            sock = socket.socket(family, socket.SOCK_DGRAM)
+            if family == socket.AF_UNIX and os.path.exists(sockaddr):
+                os.unlink(sockaddr)
+            sock.bind(sockaddr)
+            sock.settimeout(0.5)
+            self.sockets.append((sock, decoder))
+
+    def recv_frame(self):
+        return self._recv(0)
+
+    def recv_event(self):
+        return self._recv(1)
+
+    def _recv(self, channel):
+        sock, decoder = self.sockets[channel]
+        try:
+            return decoder(sock.recv(FRAME_DTYPE.itemsize + 64))
+        except socket.timeout:
+            return None
+
+    def poll(self, timeout=0.5):
+        """
+        Waits on both channels. Returns [("frame" | "event", record)].
+        """
+        ready, _, _ = select.select([sock for sock, _ in self.sockets], [], [], timeout)
+        out = []
+        for channel, (sock, _) in enumerate(self.sockets):
+            if sock in ready:
+                record = self._recv(channel)
+                if record is not None:
+                    out.append(("frame" if channel == 0 else "event", record))
+        return out
+
+    def close(self):
+        for sock, _ in self.sockets:
+            if sock.family == socket.AF_UNIX:
+                path = sock.getsockname()
+                sock.close()
+                if path and os.path.exists(path): os.unlink(path)
+            else:
+                sock.close()
+
+def benchmark(frames=20000, address="udp://127.0.0.1:5005"):
+    """
+    Publishes two synthetic hands per frame and returns the mean cost in microseconds.
+    """
+    hand = {'type': "Right", 'fingers': [0, 1, 0, 0, 0], 'scale': 120.0,
+            'landmarks': [(640 + i, 360 + i, 0.01 * i) for i in range(21)]}
+    hands = [hand, dict(hand, type="Left")]
+    subscriber = EventSubscriber(address)
+    publisher = EventPublisher(address)
+    start = time.perf_counter()
+    for _ in range(frames):
+        publisher.publish_frame(hands, tool="PAINTER", state="IDLE")
+    elapsed = time.perf_counter() - start
+    received = subscriber.recv_frame()
+    publisher.close()
+    subscriber.close()
+    assert received is not None and received["num_hands"] == 2
+    return elapsed / frames * 1e6
+
+if __name__ == "__main__":
+    # python -m utils.event_stream [address]          -> print incoming records
+    # python -m utils.event_stream --bench [address]  -> publish cost per frame
+    import sys
+    args = [a for a in sys.argv[1:] if a != "--bench"]
+    address = args[0] if args else "udp://127.0.0.1:5005"
+    if "--bench" in sys.argv:
+        print(f"EventPublisher: {benchmark(address=address):.1f} us per frame "
+              f"({FRAME_DTYPE.itemsize} byte record)")
+        sys.exit(0)
+
+    subscriber = EventSubscriber(address)
+    try:
+        while True:
+            for kind, record in subscriber.poll():
+                if kind == "event":
+                    print(f"EVENT {record}")
+                    continue
+                n = record["num_hands"]
+                tips = [tuple(record["hands"][i]["landmarks"][8][:2].astype(int).tolist()) for i in range(n)]
+                print(f"#{record['seq']} hands={n} tool={TOOLS[record['tool']]} index_tips={tips}")
+    except KeyboardInterrupt:
+        pass
+    subscriber.close()
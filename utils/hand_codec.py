@@ -0,0 +1,46 @@
+import numpy as np
+
+# Compact per-hand fields shared by the binary formats: the event stream,
+# landmark traces and finger datasets all store handedness and finger states this way
+HAND_TYPES = ("Left", "Right")
+UNKNOWN_TYPE = 255
+FINGER_BITS = 1 << np.arange(5)
+
+# Record files (traces, datasets): 8-byte header (4-byte magic, uint32 version), then fixed-size records
+HEADER_SIZE = 8
+
+TYPE_FIELD = ("type", np.uint8)       # Index into HAND_TYPES (UNKNOWN_TYPE if unrecognized)
+FINGERS_FIELD = ("fingers", np.uint8) # Bitmask, bit i = finger i up (0: Thumb ... 4: Pinky)
+
+def encode_type(hand_type):
+    return HAND_TYPES.index(hand_type) if hand_type in HAND_TYPES else UNKNOWN_TYPE
+
+def decode_type(code):
+    return HAND_TYPES[code] if code < len(HAND_TYPES) else None
+
+def encode_fingers(fingers):
+    """
+    Finger states -> bitmask: [5] -> int, [n, 5] -> uint8[n].
+    """
+    return np.asarray(fingers, dtype=np.uint8) @ FINGER_BITS
+
+def decode_fingers(mask):
+    """
+    Bitmask -> finger states: an int gives a [5] list (the hand dict format),
+    an array gives uint8[n, 5].
+    """
+    if np.ndim(mask) == 0:
+        mask = int(mask)
+        return [(mask >> i) & 1 for i in range(5)]
+    return ((np.asarray(mask)[:, None] >> np.arange(5)) & 1).astype(np.uint8)
+
+def write_header(f, magic, version):
+    f.write(magic + np.uint32(version).tobytes())
+
+def read_header(f, magic, what="record file"):
+    """
+    Reads and checks the header of an open file, leaving it at the first record. Returns the version.
+    """
+    header = f.read(HEADER_SIZE)
+    if len(header) < HEADER_SIZE or header[:4] != magic: raise ValueError(f"{f.name}: not a {what}")
+    return int(np.frombuffer(header[4:], dtype=np.uint32)[0])
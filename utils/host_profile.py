@@ -0,0 +1,199 @@
+import json
+import math
+import os
+import platform
+import time
+import cv2
+import numpy as np
+
+from utils.theme import SCREEN_SIZE
+
+PROFILE_PATH = "host_profile.json"
+INFERENCE_SCALES = [1.0, 0.75, 0.5, 0.35]  # Model input sizes tried, best quality first
+DISPLAY_SIZE = (1920, 1080)                # Label size the operator view is scaled to (full-screen 1080p)
+
+def load_profile(path=PROFILE_PATH):
+    """
+    The calibrated settings for this host, or None (missing, unreadable or from another machine).
+    """
+    if not os.path.exists(path): return None
+    try:
+        with open(path) as f:
+            profile = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if profile.get("host") != platform.node():
+        print(f"HostProfile: {path} was calibrated on {profile.get('host')}, ignoring (run --calibrate)")
+        return None
+    print(f"HostProfile: {'GPU' if profile['use_gpu'] else 'CPU'}, inference scale {profile['inference_scale']}, "
+          f"timer {profile['timer_ms']} ms (calibrated {profile['calibrated']})")
+    return profile
+
+def save_profile(profile, path=PROFILE_PATH):
+    try:
+        with open(path, "w") as f:
+            json.dump(profile, f, indent=2)
+    except OSError as e:
+        print(f"HostProfile: could not write {path}: {e}")
+
+def _frames(input_path, count):
+    """
+    Calibration input: frames of a recorded video, or synthetic ones (a noisy gradient,
+    no hands, so the model runs its slower palm detection every frame - a pessimistic cost).
+    """
+    w, h = SCREEN_SIZE
+    if input_path:
+        cap = cv2.VideoCapture(input_path)
+        frames = []
+        while len(frames) < count:
+            success, frame = cap.read()
+            if not success: break
+            frames.append(cv2.resize(frame, (w, h)) if frame.shape[:2] != (h, w) else frame)
+        cap.release()
+        if frames: return frames
+        print(f"HostProfile: could not read {input_path}, using synthetic frames")
+    rng = np.random.default_rng(0)
+    base = np.dstack([np.tile(np.linspace(0, 255, w, dtype=np.uint8), (h, 1))] * 3)
+    return [cv2.add(base, rng.integers(0, 40, (h, w, 3), dtype=np.uint8)) for _ in range(min(count, 8))]
+
+def _timed(fn, repeats):
+    """
+    (median ms, p90 ms) of fn() over `repeats` calls.
+    """
+    times = []
+    for i in range(repeats):
+        start = time.perf_counter()
+        fn(i)
+        times.append((time.perf_counter() - start) * 1000)
+    return float(np.median(times)), float(np.percentile(times, 90))
+
+def _measure_inference(model_path, use_gpu, frames, repeats, deadline):
+    """
+    {scale: (median, p90)} for one delegate, through the same VisionEngine path the app uses.
+    Empty if the delegate is unavailable.
+    """
+    from engine.vision_engine import VisionEngine
+    try:
+        vision = VisionEngine(model_path, use_gpu=use_gpu, idle_after=0, tool_profiles=True)
+        vision.set_tool("PAINTER") # The startup tool
+        for frame in frames[:3]: vision.process_frame(frame) # Graph init / GPU upload
+    except Exception as e:
+        print(f"HostProfile: {'GPU' if use_gpu else 'CPU'} delegate unavailable: {e}")
+        return {}
+    results = {}
+    for scale in INFERENCE_SCALES:
+        if time.time() > deadline: break
+        vision.inference_scale = scale
+        results[scale] = _timed(lambda i: vision.process_frame(frames[i % len(frames)]), repeats)
+        print(f"HostProfile: {'GPU' if use_gpu else 'CPU'} inference at {scale:.2f}: "
+              f"{results[scale][0]:.1f} ms median, {results[scale][1]:.1f} ms p90")
+    vision.close()
+    return results
+
+def _measure_display(frames, repeats):
+    """
+    Per-frame cost outside the model: mirror, slide blend (60% operator view), BGR->RGB
+    and the QImage scale to the label, smooth vs fast. Headless: QImage needs no display.
+    """
+    from PySide6.QtCore import Qt, QSize
+    from PySide6.QtGui import QImage
+    from engine.hand_history import HandHistory
+    from features.presentation_tool import PresentationTool
+    from utils.task_executor import TaskExecutor
+
+    executor = TaskExecutor(workers=1)
+    present = PresentationTool(HandHistory(), load=False, executor=executor)
+    slide = cv2.resize(frames[0], (1920, 1080)) # A full-HD slide, downscaled every frame like the real deck
+    frame = np.empty_like(frames[0])
+    rgb = np.empty_like(frames[0])
+    h, w = frame.shape[:2]
+
+    def composite(i):
+        cv2.flip(frames[i % len(frames)], 1, dst=frame)
+        present.draw_slide(frame, slide, opacity=0.6)
+    def display(mode):
+        def run(i):
+            cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=rgb)
+            QImage(rgb.data, w, h, 3 * w, QImage.Format_RGB888).scaled(QSize(*DISPLAY_SIZE), Qt.KeepAspectRatio, mode)
+        return run
+    costs = {"composite": _timed(composite, repeats),
+             "display_smooth": _timed(display(Qt.SmoothTransformation), repeats),
+             "display_fast": _timed(display(Qt.FastTransformation), repeats)}
+    executor.shutdown()
+    for name, (median, p90) in costs.items():
+        print(f"HostProfile: {name}: {median:.1f} ms median, {p90:.1f} ms p90")
+    return costs
+
+def choose(inference, costs, target_ms):
+    """
+    Best quality that meets the target: the largest inference scale whose p90 frame time
+    (fastest delegate at that scale + composite + display) fits, with smooth scaling if
+    that still fits - tracking quality comes before display quality. Nothing fits: the
+    cheapest combination. Returns the profile settings.
+    """
+    options = []
+    for scale in INFERENCE_SCALES:
+        timings = [(results[scale][1], use_gpu) for use_gpu, results in inference.items() if scale in results]
+        if timings: options.append((scale,) + min(timings))
+    if not options: return None
+    composite = costs["composite"][1]
+    chosen = None
+    for scale, p90, use_gpu in options:
+        for smooth in (True, False):
+            display = costs["display_smooth" if smooth else "display_fast"][1]
+            if p90 + composite + display <= target_ms:
+                chosen = (scale, p90, use_gpu, smooth, p90 + composite + display)
+                break
+        if chosen: break
+    if chosen is None:
+        scale, p90, use_gpu = min(options, key=lambda o: o[1])
+        chosen = (scale, p90, use_gpu, False, p90 + composite + costs["display_fast"][1])
+        print(f"HostProfile: nothing meets {target_ms:.0f} ms, using the cheapest setup ({chosen[4]:.1f} ms)")
+    scale, p90, use_gpu, smooth, frame_ms = chosen
+    return {
+        "use_gpu": use_gpu,
+        "inference_scale": scale,
+        "smooth_scaling": smooth,
+        "frame_ms": round(frame_ms, 2),
+        # Don't poll faster than a frame can be produced; 16 ms (~60 FPS) is the ceiling
+        "timer_ms": max(16, math.ceil(frame_ms)),
+        # OneEuro cutoffs assume the sampling rate: the camera's ~30 fps, or less on a slow host
+        "smoothing_freq": round(min(30.0, 1000.0 / max(frame_ms, 16)), 1)
+    }
+
+def calibrate(model_path="hand_landmarker.task", target_ms=33.0, input_path=None, path=PROFILE_PATH,
+              repeats=30, time_limit=50.0):
+    """
+    Headless benchmark of this host: inference per delegate and scale, compositing and
+    display scaling. Writes the chosen settings to `path` (loaded by later starts).
+    Stops starting new measurements after `time_limit` seconds.
+    """
+    start = time.time()
+    deadline = start + time_limit
+    frames = _frames(input_path, repeats)
+    print(f"HostProfile: calibrating on {len(frames)} {'recorded' if input_path else 'synthetic'} frames, "
+          f"target {target_ms:.0f} ms")
+
+    # 1. Non-model costs first: they decide what is left for inference
+    costs = _measure_display(frames, repeats)
+    # 2. Inference per delegate (the GPU one is skipped where it can't initialise)
+    inference = {}
+    for use_gpu in (False, True):
+        if time.time() > deadline: break
+        results = _measure_inference(model_path, use_gpu, frames, repeats, deadline)
+        if results: inference[use_gpu] = results
+
+    settings = choose(inference, costs, target_ms)
+    if settings is None:
+        print(f"HostProfile: no inference delegate worked (model at {model_path}?), profile not written")
+        return None
+    profile = dict(host=platform.node(), calibrated=time.strftime("%Y-%m-%d %H:%M"), target_ms=target_ms,
+                   **settings,
+                   measurements={"costs": costs,
+                                 "inference": {("gpu" if use_gpu else "cpu"): {str(s): t for s, t in results.items()}
+                                               for use_gpu, results in inference.items()}})
+    save_profile(profile, path)
+    print(f"HostProfile: {'GPU' if settings['use_gpu'] else 'CPU'}, inference scale {settings['inference_scale']}, "
+          f"{'smooth' if settings['smooth_scaling'] else 'fast'} scaling, {settings['frame_ms']:.1f} ms per frame, "
+          f"timer {settings['timer_ms']} ms -> {path} ({time.time() - start:.0f} s)")
+    return profile
@@ -0,0 +1,173 @@
+import os
+import time
+import numpy as np
+
+from utils.hand_codec import (HEADER_SIZE, TYPE_FIELD, FINGERS_FIELD, encode_type, decode_type,
+                              encode_fingers, decode_fingers, write_header, read_header)
+
+# Trace file (utils.hand_codec record file), records appended as frames arrive
+TRACE_MAGIC = b"VHLT"
+TRACE_VERSION = 1
+
+# One record per hand (num_hands records share a frame number). A run of frames
+# without hands is stored as a single empty record: the frames up to the next
+# record are empty, timestamps in between are interpolated. An idle hour costs nothing.
+TRACE_DTYPE = np.dtype([
+    ("timestamp", np.float64),
+    ("frame", np.uint32),
+    ("num_hands", np.uint8),
+    ("slot", np.uint8),                  # Position of this hand in the frame's list
+    TYPE_FIELD,
+    FINGERS_FIELD,
+    ("landmarks", np.float32, (21, 3))   # Pixel x, y and relative z, exactly as process_frame returned them
+])
+
+class TraceWriter:
+    """
+    Appends the hands VisionEngine.process_frame returned, one frame per write().
+    268 bytes per hand per frame; a hand in view for an hour at 30 fps is ~29 MB.
+    Writes go through a buffered file: ~20 us per frame on the GUI thread.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "wb")
+        write_header(self.file, TRACE_MAGIC, TRACE_VERSION)
+        self.records = np.zeros(4, dtype=TRACE_DTYPE) # Reused every frame
+        self.frames = 0
+        self.in_empty_run = False
+        self.last_empty = None # (timestamp, frame) of the latest unwritten empty frame
+
+    def write(self, timestamp, hands):
+        frame = self.frames
+        self.frames += 1
+        if not hands:
+            if self.in_empty_run:
+                self.last_empty = (timestamp, frame)
+                return
+            self.in_empty_run = True
+            self.last_empty = None
+            self._write_empty(timestamp, frame)
+            return
+        self.in_empty_run = False
+        self.last_empty = None
+
+        n = min(len(hands), len(self.records))
+        recs = self.records[:n]
+        recs["timestamp"] = timestamp
+        recs["frame"] = frame
+        recs["num_hands"] = n
+        for slot, hand in enumerate(hands[:n]):
+            rec = recs[slot]
+            rec["slot"] = slot
+            rec["type"] = encode_type(hand['type'])
+            rec["fingers"] = encode_fingers(hand['fingers'])
+            lms = np.asarray(hand['landmarks'], dtype=np.float32)
+            rec["landmarks"] = 0
+            rec["landmarks"][:, :lms.shape[1]] = lms[:, :3] # Smoothed landmarks carry no z
+        self.file.write(recs.tobytes())
+
+    def _write_empty(self, timestamp, frame):
+        rec = self.records[:1]
+        rec["timestamp"] = timestamp
+        rec["frame"] = frame
+        rec["num_hands"] = 0
+        rec["landmarks"] = 0
+        self.file.write(rec.tobytes())
+
+    def close(self):
+        if self.file.closed: return
+        # Keep the length of a trailing empty run
+        if self.last_empty is not None:
+            self._write_empty(*self.last_empty)
+        self.file.close()
+        print(f"TraceWriter: {self.frames} frames, {os.path.getsize(self.path) / 1e6:.1f} MB in {self.path}")
+
+class TraceReader:
+    """
+    Memory-mapped view of a trace. Iterating yields (timestamp, hands) for every
+    recorded frame, hands in the same dict format process_frame returns.
+    """
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            read_header(f, TRACE_MAGIC, "landmark trace")
+        # A crash can leave a partial record at the end: ignore it
+        count = (os.path.getsize(path) - HEADER_SIZE) // TRACE_DTYPE.itemsize
+        self.records = (np.memmap(path, dtype=TRACE_DTYPE, mode="r", offset=HEADER_SIZE, shape=(count,))
+                        if count else np.zeros(0, dtype=TRACE_DTYPE))
+        frames = self.records["frame"]
+        self.starts = np.flatnonzero(np.r_[True, frames[1:] != frames[:-1]]) if count else np.zeros(0, dtype=int)
+
+    def __len__(self):
+        return int(self.records["frame"][-1]) + 1 if len(self.records) else 0
+
+    @property
+    def duration(self):
+        if not len(self.records): return 0.0
+        return float(self.records["timestamp"][-1] - self.records["timestamp"][0])
+
+    def _hands(self, start):
+        n = int(self.records["num_hands"][start])
+        hands = []
+        for rec in self.records[start:start + n]:
+            lms = [(int(x), int(y), float(z)) for x, y, z in rec["landmarks"].tolist()]
+            p0, p9 = np.array(lms[0][:2]), np.array(lms[9][:2])
+            hands.append({
+                'type': decode_type(rec["type"]),
+                'landmarks': lms,
+                'raw_landmarks': None,
+                'scale': np.linalg.norm(p0 - p9),
+                'fingers': decode_fingers(rec["fingers"])
+            })
+        return hands
+
+    def __iter__(self):
+        ts, frames = self.records["timestamp"], self.records["frame"]
+        for k, start in enumerate(self.starts):
+            yield float(ts[start]), self._hands(start)
+            if k + 1 == len(self.starts): break
+            # Unrecorded frames of an empty run
+            nxt = self.starts[k + 1]
+            gap = int(frames[nxt]) - int(frames[start])
+            for j in range(1, gap):
+                yield float(ts[start] + (ts[nxt] - ts[start]) * j / gap), []
+
+class TraceReplayer:
+    """
+    Paces a trace for the live loop: next_frame() returns the next (timestamp, hands)
+    once it is due (realtime) or immediately (fast), None while waiting.
+    """
+    def __init__(self, path, realtime=True):
+        self.reader = TraceReader(path)
+        self.frames = iter(self.reader)
+        self.realtime = realtime
+        self.pending = next(self.frames, None)
+        self.finished = self.pending is None
+        self.t0 = None
+        self.start = None
+        self.played = 0
+
+    def next_frame(self):
+        if self.pending is None: return None
+        now = time.perf_counter()
+        if self.t0 is None:
+            self.t0, self.start = self.pending[0], now
+        if self.realtime and self.pending[0] - self.t0 > now - self.start: return None
+        item, self.pending = self.pending, next(self.frames, None)
+        self.finished = self.pending is None
+        self.played += 1
+        return item
+
+    def elapsed(self):
+        return time.perf_counter() - self.start if self.start else 0.0
+
+if __name__ == "__main__":
+    # python -m utils.landmark_trace PATH: summary of a trace
+    import sys
+    reader = TraceReader(sys.argv[1])
+    start = time.perf_counter()
+    with_hands = sum(1 for _, hands in reader if hands)
+    decode = time.perf_counter() - start
+    size = os.path.getsize(sys.argv[1])
+    print(f"{sys.argv[1]}: {len(reader)} frames ({with_hands} with hands) over {reader.duration:.1f} s, "
+          f"{size / 1e6:.2f} MB ({size / max(reader.duration, 1e-9) * 3600 / 1e6:.1f} MB/h), "
+          f"decoded in {decode:.2f} s")
@@ -0,0 +1,112 @@
+import os
+import queue
+import threading
+import time
+import cv2
+
+# Queue-full policies
+DROP_OLDEST = "drop_oldest" # Keep the live edge, discard the stale backlog
+DROP_NEWEST = "drop_newest" # Keep the backlog, discard the incoming frame
+
+FOURCC_BY_EXT = {
+    ".mp4": "mp4v",
+    ".avi": "MJPG",
+    ".mkv": "XVID"
+}
+
+class SessionRecorder:
+    """
+    Encodes frames to a video file on a dedicated writer thread.
+    submit() never blocks: when the bounded queue is full a frame is dropped
+    according to `policy` and counted. Output timing follows capture timestamps,
+    so live-loop jitter is absorbed by duplicating or skipping frames.
+    """
+    def __init__(self, path, fps=30, frame_size=(1280, 720), queue_size=32, policy=DROP_OLDEST):
+        self.path = path
+        self.fps = fps
+        self.frame_size = frame_size
+        self.policy = policy
+
+        fourcc = FOURCC_BY_EXT.get(os.path.splitext(path)[1].lower(), "mp4v")
+        self.writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*fourcc), fps, frame_size)
+        if not self.writer.isOpened():
+            raise IOError(f"SessionRecorder: cannot open '{path}' for writing")
+
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.submitted = 0
+        self.dropped = 0     # Lost to a full queue
+        self.written = 0     # Frames in the output file
+        self.duplicated = 0  # Repeats inserted to fill timing gaps
+        self.skipped = 0     # Arrived faster than the output rate
+
+        self.t0 = None
+        self._stop = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="SessionRecorder", daemon=True)
+        self.thread.start()
+
+    def submit(self, frame, timestamp=None):
+        """
+        Queues a frame for encoding. The caller must not modify `frame` afterwards.
+        """
+        if self._stop.is_set(): return
+        item = (timestamp if timestamp is not None else time.time(), frame)
+        self.submitted += 1
+        try:
+            self.queue.put_nowait(item)
+        except queue.Full:
+            self.dropped += 1
+            if self.policy == DROP_OLDEST:
+                try:
+                    self.queue.get_nowait()
+                    self.queue.put_nowait(item)
+                except (queue.Empty, queue.Full):
+                    pass
+
+    def _run(self):
+        next_idx = 0
+        last = None
+        while not (self._stop.is_set() and self.queue.empty()):
+            try:
+                ts, frame = self.queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+            if self.t0 is None: self.t0 = ts
+            if (frame.shape[1], frame.shape[0]) != self.frame_size:
+                frame = cv2.resize(frame, self.frame_size)
+
+            # Timestamp pacing: frame belongs to output slot round((ts - t0) * fps)
+            target_idx = int(round((ts - self.t0) * self.fps))
+            if target_idx < next_idx:
+                self.skipped += 1
+                continue
+            while last is not None and next_idx < target_idx:
+                self.writer.write(last)
+                self.duplicated += 1
+                next_idx += 1
+
+            self.writer.write(frame)
+            last = frame
+            next_idx = target_idx + 1
+            self.written = next_idx
+
+    def stats(self):
+        return {
+            "submitted": self.submitted,
+            "dropped": self.dropped,
+            "written": self.written,
+            "duplicated": self.duplicated,
+            "skipped": self.skipped
+        }
+
+    def stop(self):
+        """
+        Flushes the queue, finalizes the file and reports drop statistics.
+        """
+        if self._stop.is_set(): return
+        self._stop.set()
+        self.thread.join()
+        self.writer.release()
+        s = self.stats()
+        print(f"SessionRecorder: {self.path} -> {s['written']} frames "
+              f"(dropped {s['dropped']}, duplicated {s['duplicated']}, skipped {s['skipped']})")
@@ -0,0 +1,172 @@
+import struct
+import time
+import numpy as np
+from multiprocessing import shared_memory, resource_tracker
+
+# Memory Layout
+# [Global Header][Slot 0 Header][Slot 0 Pixels]...[Slot N-1 Header][Slot N-1 Pixels]
+# Global: magic, version, num_slots, slot_bytes, latest_seq
+# Slot:   seq_begin, timestamp, height, width, channels, seq_end
+MAGIC = b"VHRB"
+VERSION = 1
+GLOBAL_HEADER = struct.Struct("<4sIIQQ")
+SLOT_HEADER = struct.Struct("<QdIIIQ")
+SLOT_ALIGN = 64
+
+def _slot_stride(slot_bytes):
+    raw = SLOT_HEADER.size + slot_bytes
+    return (raw + SLOT_ALIGN - 1) // SLOT_ALIGN * SLOT_ALIGN
+
+def _slot_offset(index, slot_bytes):
+    return GLOBAL_HEADER.size + index * _slot_stride(slot_bytes)
+
+class SharedFrameWriter:
+    """
+    Publishes frames into a shared-memory ring buffer.
+    Lock-free: the writer never waits on readers, slow readers simply miss frames.
+    """
+    def __init__(self, name="visionhand_audience", shape=(720, 1280, 3), num_slots=4):
+        self.name = name
+        self.num_slots = num_slots
+        self.slot_bytes = int(np.prod(shape))
+        size = GLOBAL_HEADER.size + num_slots * _slot_stride(self.slot_bytes)
+
+        try:
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            # Stale segment from a crashed session: reclaim it
+            stale = shared_memory.SharedMemory(name=name)
+            stale.close()
+            stale.unlink()
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+
+        self.buf = self.shm.buf
+        self.seq = 0
+        self.dropped = 0
+        SLOT_HEADER.pack_into(self.buf, GLOBAL_HEADER.size, 0, 0.0, 0, 0, 0, 0)
+        GLOBAL_HEADER.pack_into(self.buf, 0, MAGIC, VERSION, num_slots, self.slot_bytes, 0)
+
+    def write(self, frame):
+        """
+        Copies a frame into the next slot and publishes it. Never blocks.
+        """
+        if self.buf is None: return False
+        if frame.nbytes > self.slot_bytes:
+            self.dropped += 1
+            return False
+
+        self.seq += 1
+        offset = _slot_offset(self.seq % self.num_slots, self.slot_bytes)
+        h, w = frame.shape[:2]
+        ch = frame.shape[2] if frame.ndim == 3 else 1
+
+        # 1. Invalidate slot (seq_end != seq_begin while writing)
+        SLOT_HEADER.pack_into(self.buf, offset, self.seq, time.time(), h, w, ch, 0)
+        # 2. Copy pixels
+        data_start = offset + SLOT_HEADER.size
+        dst = np.ndarray(frame.shape, dtype=np.uint8, buffer=self.buf, offset=data_start)
+        np.copyto(dst, frame)
+        # 3. Commit slot, then advertise it
+        struct.pack_into("<Q", self.buf, offset + SLOT_HEADER.size - 8, self.seq)
+        struct.pack_into("<Q", self.buf, GLOBAL_HEADER.size - 8, self.seq)
+        return True
+
+    def close(self):
+        if self.buf is None: return
+        self.buf = None
+        self.shm.close()
+        self.shm.unlink()
+
+class FrameMeta:
+    __slots__ = ("seq", "timestamp", "shape", "offset")
+
+    def __init__(self, seq, timestamp, shape, offset):
+        self.seq = seq
+        self.timestamp = timestamp
+        self.shape = shape
+        self.offset = offset
+
+class SharedFrameReader:
+    """
+    Attaches to a SharedFrameWriter segment from any local process.
+    Frames are returned as zero-copy NumPy views into shared memory.
+    track=True keeps the attach registered with the resource tracker: for children
+    sharing the writer's tracker (spawned by it), where unregistering would drop the
+    writer's own registration. Independent readers leave it False.
+    """
+    def __init__(self, name="visionhand_audience", track=False):
+        self.shm = shared_memory.SharedMemory(name=name)
+        # An independent reader's tracker would unlink the writer's segment on exit
+        if not track:
+            try:
+                resource_tracker.unregister(self.shm._name, "shared_memory")
+            except Exception:
+                pass
+
+        self.buf = self.shm.buf
+        magic, version, self.num_slots, self.slot_bytes, _ = GLOBAL_HEADER.unpack_from(self.buf, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"SharedFrameReader: '{name}' is not a VisionHand frame ring")
+        self.last_seq = 0
+
+    def latest_seq(self):
+        return struct.unpack_from("<Q", self.buf, GLOBAL_HEADER.size - 8)[0]
+
+    def read_latest(self, copy=False):
+        """
+        Returns (meta, frame) for the newest committed frame, or (None, None).
+        With copy=False the frame is a view: check is_valid(meta) after use.
+        """
+        seq = self.latest_seq()
+        if seq == 0: return None, None
+
+        offset = _slot_offset(seq % self.num_slots, self.slot_bytes)
+        seq_begin, ts, h, w, ch, seq_end = SLOT_HEADER.unpack_from(self.buf, offset)
+        if seq_begin != seq_end or seq_begin != seq:
+            return None, None # Writer lapped us mid-read
+
+        shape = (h, w, ch) if ch > 1 else (h, w)
+        frame = np.ndarray(shape, dtype=np.uint8, buffer=self.buf, offset=offset + SLOT_HEADER.size)
+        meta = FrameMeta(seq, ts, shape, offset)
+        if copy:
+            frame = frame.copy()
+            if not self.is_valid(meta): return None, None
+
+        self.last_seq = seq
+        return meta, frame
+
+    def read_new(self, copy=False, timeout=1.0, poll=0.001):
+        """
+        Waits until a frame newer than the last one read is published.
+        """
+        deadline = time.time() + timeout
+        while self.latest_seq() == self.last_seq:
+            if time.time() > deadline: return None, None
+            time.sleep(poll)
+        return self.read_latest(copy=copy)
+
+    def is_valid(self, meta):
+        """
+        True if the slot backing `meta` has not been overwritten since it was read.
+        """
+        seq_begin = struct.unpack_from("<Q", self.buf, meta.offset)[0]
+        seq_end = struct.unpack_from("<Q", self.buf, meta.offset + SLOT_HEADER.size - 8)[0]
+        return seq_begin == seq_end == meta.seq
+
+    def close(self):
+        if self.buf is None: return
+        self.buf = None
+        self.shm.close()
+
+if __name__ == "__main__":
+    # Minimal viewer: python -m utils.shm_ring [name]
+    import sys
+    import cv2
+    reader = SharedFrameReader(sys.argv[1] if len(sys.argv) > 1 else "visionhand_audience")
+    while True:
+        meta, frame = reader.read_new(copy=True)
+        if frame is not None:
+            cv2.imshow("Shared Audience Feed", frame)
+        if cv2.waitKey(1) & 0xFF == 27: break
+    reader.close()
@@ -0,0 +1,150 @@
+import os
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import cv2
+import numpy as np
+from PySide6.QtCore import QObject, Signal
+
+from features.presentation_tool import slide_rect
+from utils.task_executor import PRIORITY_USER
+from utils.theme import SCREEN_SIZE
+
+def _render_page(index, slide, ink, rect, fmt, out_path, quality):
+    """
+    Pool worker: flattens one slide (+ ink mapped from screen space) at source resolution.
+    PNG pages are written here; PDF pages come back as JPEG bytes.
+    """
+    sh, sw = slide.shape[:2]
+    page = slide
+    if slide.ndim == 2:
+        page = cv2.cvtColor(slide, cv2.COLOR_GRAY2BGR)
+    elif slide.shape[2] == 4:
+        # Transparent slides go onto white paper
+        alpha = slide[:, :, 3:] / 255.0
+        page = (slide[:, :, :3] * alpha + 255 * (1 - alpha)).astype(np.uint8)
+
+    if ink:
+        # Screen -> slide pixels: inverse of the fit / zoom / offset used on screen
+        x1, y1, nw, nh = rect
+        fx, fy = sw / nw, sh / nh
+        m = np.float32([[fx, 0, -x1 * fx], [0, fy, -y1 * fy]])
+        page = page.astype(np.float32)
+        for layer in ink:
+            warped = cv2.warpAffine(layer, m, (sw, sh), flags=cv2.INTER_LINEAR, borderValue=0)
+            alpha = warped[:, :, 3:] / 255.0
+            page = page * (1 - alpha) + warped[:, :, :3] * alpha
+        page = page.astype(np.uint8)
+
+    if fmt == "png":
+        path = os.path.join(out_path, f"slide_{index + 1:03d}.png")
+        cv2.imwrite(path, page)
+        return index, path
+    ok, buf = cv2.imencode(".jpg", page, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    return index, (buf.tobytes(), sw, sh)
+
+def write_pdf(path, pages, dpi=150):
+    """
+    Minimal multi-page PDF: one full-page JPEG (DCTDecode) per page, no dependencies.
+    `pages` is [(jpeg_bytes, width_px, height_px)].
+    """
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None]
+    kids = []
+    for jpeg, w, h in pages:
+        pw, ph = w * 72 / dpi, h * 72 / dpi
+        first = len(objects) + 1 # Page, image, content object numbers
+        kids.append(f"{first} 0 R")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {pw:.2f} {ph:.2f}] "
+                       f"/Resources << /XObject << /Im0 {first + 1} 0 R >> >> /Contents {first + 2} 0 R >>".encode())
+        objects.append(f"<< /Type /XObject /Subtype /Image /Width {w} /Height {h} /ColorSpace /DeviceRGB "
+                       f"/BitsPerComponent 8 /Filter /DCTDecode /Length {len(jpeg)} >>\nstream\n".encode()
+                       + jpeg + b"\nendstream")
+        content = f"q {pw:.2f} 0 0 {ph:.2f} 0 0 cm /Im0 Do Q".encode()
+        objects.append(f"<< /Length {len(content)} >>\nstream\n".encode() + content + b"\nendstream")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>".encode()
+
+    with open(path, "wb") as f:
+        f.write(b"%PDF-1.4\n")
+        offsets = []
+        for i, body in enumerate(objects, start=1):
+            offsets.append(f.tell())
+            f.write(f"{i} 0 obj\n".encode() + body + b"\nendobj\n")
+        xref = f.tell()
+        f.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode())
+        for offset in offsets:
+            f.write(f"{offset:010d} 00000 n \n".encode())
+        f.write(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode())
+
+class SlideExporter(QObject):
+    """
+    Flattens slides and ink into a PNG set or a PDF handout without touching the GUI thread.
+    export() only snapshots state; a TaskExecutor task drives a process pool that
+    composites and encodes, and progress / completion come back as Qt signals.
+    Ink is stored in screen space and not per slide, so it is flattened onto the
+    slide that is on screen when the export starts.
+    """
+    progress = Signal(int, int)   # done, total
+    finished = Signal(str)        # Output path
+    failed = Signal(str)
+
+    def __init__(self, executor, out_dir="exports", workers=None, quality=92):
+        super().__init__()
+        self.executor = executor
+        self.out_dir = out_dir
+        self.workers = workers or max(1, min(4, (os.cpu_count() or 2) - 1))
+        self.quality = quality
+        self.task = None
+        self.pool = None
+
+    @property
+    def busy(self):
+        return self.task is not None and not self.task.done
+
+    def export(self, present_tool, canvas, scale=1.0, offset=(0, 0), fmt="pdf"):
+        """
+        Starts an export. Returns False if one is already running or there is nothing to export.
+        """
+        slides = present_tool.slides # Swapped atomically on reload, the arrays are never edited
+        if self.busy or not slides: return False
+
+        # Snapshot: only layers that hold ink, copied so drawing can continue
+        ink = [layer.copy() for layer in canvas.layers.values() if layer[:, :, 3].any()]
+        current = present_tool.current_idx % len(slides) if present_tool.visible else None
+        rect = None
+        if current is not None:
+            rect = slide_rect(slides[current].shape, (SCREEN_SIZE[1], SCREEN_SIZE[0]), scale, offset)
+
+        stamp = time.strftime("%Y%m%d_%H%M%S")
+        out_path = os.path.join(self.out_dir, f"session_{stamp}" + (".pdf" if fmt == "pdf" else ""))
+        self.task = self.executor.submit(self._run, slides, ink, current, rect, fmt, out_path,
+                                         priority=PRIORITY_USER, name="export")
+        return True
+
+    def _run(self, slides, ink, current, rect, fmt, out_path):
+        try:
+            os.makedirs(out_path if fmt == "png" else self.out_dir, exist_ok=True)
+            # Spawn keeps Qt state out of the workers
+            self.pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+            futures = [self.pool.submit(_render_page, i, slide, ink if i == current else None,
+                                        rect, fmt, out_path, self.quality)
+                       for i, slide in enumerate(slides)]
+            pages = [None] * len(slides)
+            for done, future in enumerate(as_completed(futures), start=1):
+                index, page = future.result()
+                pages[index] = page
+                self.progress.emit(done, len(slides))
+            if fmt == "pdf":
+                write_pdf(out_path, pages)
+            print(f"SlideExporter: wrote {len(slides)} slides to {out_path}")
+            self.finished.emit(out_path)
+        except Exception as e:
+            print(f"SlideExporter: export failed: {e}")
+            self.failed.emit(str(e))
+        finally:
+            if self.pool:
+                self.pool.shutdown(wait=False, cancel_futures=True)
+                self.pool = None
+
+    def stop(self):
+        if self.pool:
+            self.pool.shutdown(wait=False, cancel_futures=True)
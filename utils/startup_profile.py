@@ -0,0 +1,42 @@
+import threading
+import time
+from contextlib import contextmanager
+
+class StartupProfiler:
+    """
+    Records how long each startup phase takes, including phases that run on
+    background threads. Milestones are measured from process start.
+    """
+    def __init__(self, enabled=False, t0=None):
+        self.enabled = enabled
+        self.t0 = t0 if t0 is not None else time.perf_counter()
+        self.phases = [] # (name, thread, start, duration)
+        self.milestones = []
+        self.reported = False
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            with self._lock:
+                self.phases.append((name, threading.current_thread().name, start - self.t0, duration))
+
+    def mark(self, name):
+        with self._lock:
+            self.milestones.append((name, time.perf_counter() - self.t0))
+
+    def report(self):
+        if self.reported: return
+        self.reported = True
+        if not self.enabled: return
+
+        print("Startup Profile")
+        print(f"  {'phase':<22}{'thread':<16}{'start ms':>10}{'took ms':>10}")
+        for name, thread, start, duration in sorted(self.phases, key=lambda p: p[2]):
+            print(f"  {name:<22}{thread:<16}{start * 1000:>10.1f}{duration * 1000:>10.1f}")
+        for name, at in self.milestones:
+            print(f"  * {name:<36}{at * 1000:>10.1f}")
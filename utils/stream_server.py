@@ -0,0 +1,193 @@
+import base64
+import hashlib
+import struct
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import cv2
+
+BOUNDARY = "visionhandframe"
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+INDEX_HTML = """<!doctype html>
+<html><head><title>VisionHand Audience</title>
+<style>body{margin:0;background:#000}img{width:100vw;height:100vh;object-fit:contain}</style>
+</head><body><img src="/stream.mjpg"></body></html>"""
+
+class AudienceStreamServer:
+    """
+    Serves the composited audience feed over MJPEG (/stream.mjpg) and WebSocket (/ws).
+    Each frame is JPEG-encoded once on a small worker pool and the same bytes are
+    fanned out to every client. Clients always receive the newest frame, so a slow
+    viewer skips frames instead of slowing the encoder or other viewers.
+    """
+    def __init__(self, host="127.0.0.1", port=8080, quality=80, encode_workers=2):
+        self.quality = quality
+        self.encode_workers = encode_workers
+        self.pool = ThreadPoolExecutor(max_workers=encode_workers, thread_name_prefix="JpegEncode")
+        self.encode_slots = threading.Semaphore(encode_workers)
+        self.submitted = 0
+        self.encoded = 0
+        self.skipped = 0
+        self.encode_ms = 0.0
+
+        # Latest encoded frame shared by all clients
+        self.cond = threading.Condition()
+        self.seq = 0
+        self.jpeg = None
+        self.clients = 0
+        self.running = True
+
+        server = self
+        class Handler(_StreamHandler):
+            stream = server
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name="StreamServer", daemon=True)
+        self.thread.start()
+        print(f"AudienceStreamServer: http://{host}:{port}/ (MJPEG /stream.mjpg, WebSocket /ws)")
+
+    def publish(self, frame):
+        """
+        Queues a frame for encoding. Never blocks; skipped if the encoders are busy
+        or nobody is watching.
+        """
+        if not self.running or self.clients == 0: return
+        self.submitted += 1
+        if not self.encode_slots.acquire(blocking=False):
+            self.skipped += 1
+            return
+        self.pool.submit(self._encode, frame, self.submitted)
+
+    def _encode(self, frame, order):
+        try:
+            start = time.perf_counter()
+            ok, buf = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, self.quality])
+            self.encode_ms = (time.perf_counter() - start) * 1000
+            if not ok: return
+            with self.cond:
+                # Parallel encoders may finish out of order: never publish an older frame
+                if order > self.seq:
+                    self.seq = order
+                    self.jpeg = buf.tobytes()
+                    self.encoded += 1
+                    self.cond.notify_all()
+        finally:
+            self.encode_slots.release()
+
+    def wait_frame(self, last_seq, timeout=1.0):
+        """
+        Blocks a client thread until a frame newer than last_seq exists.
+        """
+        with self.cond:
+            self.cond.wait_for(lambda: self.seq > last_seq or not self.running, timeout=timeout)
+            return self.seq, self.jpeg
+
+    def stop(self):
+        self.running = False
+        with self.cond:
+            self.cond.notify_all()
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        self.pool.shutdown(wait=False)
+
+class _StreamHandler(BaseHTTPRequestHandler):
+    stream = None
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path == "/":
+            body = INDEX_HTML.encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        elif self.path.startswith("/stream.mjpg"):
+            self._serve_mjpeg()
+        elif self.path.startswith("/ws") and self.headers.get("Upgrade", "").lower() == "websocket":
+            self._serve_websocket()
+        else:
+            self.send_error(404)
+
+    def _client_loop(self, send):
+        stream = self.stream
+        with stream.cond:
+            stream.clients += 1
+        last_seq = 0
+        try:
+            while stream.running:
+                seq, jpeg = stream.wait_frame(last_seq)
+                if jpeg is None or seq == last_seq: continue
+                # A slow socket only delays this client; it picks up the newest frame next
+                send(jpeg)
+                last_seq = seq
+        except (BrokenPipeError, ConnectionResetError, OSError):
+            pass
+        finally:
+            with stream.cond:
+                stream.clients -= 1
+
+    def _serve_mjpeg(self):
+        self.send_response(200)
+        self.send_header("Content-Type", f"multipart/x-mixed-replace; boundary={BOUNDARY}")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+
+        def send(jpeg):
+            self.wfile.write(f"--{BOUNDARY}\r\nContent-Type: image/jpeg\r\nContent-Length: {len(jpeg)}\r\n\r\n".encode())
+            self.wfile.write(jpeg)
+            self.wfile.write(b"\r\n")
+            self.wfile.flush()
+        self._client_loop(send)
+
+    def _serve_websocket(self):
+        key = self.headers.get("Sec-WebSocket-Key", "")
+        accept = base64.b64encode(hashlib.sha1((key + WS_GUID).encode()).digest()).decode()
+        self.send_response(101, "Switching Protocols")
+        self.send_header("Upgrade", "websocket")
+        self.send_header("Connection", "Upgrade")
+        self.send_header("Sec-WebSocket-Accept", accept)
+        self.end_headers()
+
+        def send(jpeg):
+            # Unmasked binary frame (server -> client)
+            n = len(jpeg)
+            if n < 126: header = struct.pack("!BB", 0x82, n)
+            elif n < 65536: header = struct.pack("!BBH", 0x82, 126, n)
+            else: header = struct.pack("!BBQ", 0x82, 127, n)
+            self.wfile.write(header + jpeg)
+            self.wfile.flush()
+        self._client_loop(send)
+        self.close_connection = True
+
+def measure_fps(url="http://127.0.0.1:8080/stream.mjpg", seconds=5.0):
+    """
+    Reference MJPEG client: returns delivered frames per second.
+    """
+    import urllib.request
+    frames = 0
+    with urllib.request.urlopen(url, timeout=5) as resp:
+        start = time.time()
+        while time.time() - start < seconds:
+            line = resp.readline()
+            if not line: break
+            if line.lower().startswith(b"content-length:"):
+                length = int(line.split(b":")[1])
+                resp.readline() # Blank line
+                resp.read(length)
+                frames += 1
+        elapsed = time.time() - start
+    return frames / elapsed if elapsed > 0 else 0.0
+
+if __name__ == "__main__":
+    # Local test client: python -m utils.stream_server [url] [seconds]
+    import sys
+    url = sys.argv[1] if len(sys.argv) > 1 else "http://127.0.0.1:8080/stream.mjpg"
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 5.0
+    print(f"Delivered FPS: {measure_fps(url, seconds):.1f}")
@@ -0,0 +1,208 @@
+import heapq
+import itertools
+import threading
+import time
+from PySide6.QtCore import QObject, Signal
+
+# Lower runs first
+PRIORITY_USER = 0       # Something the operator is waiting for (slide load, export)
+PRIORITY_NORMAL = 1
+PRIORITY_PREFETCH = 2   # Speculative work (thumbnails); never takes the last free worker
+
+PENDING, RUNNING, DONE, FAILED, CANCELLED = "pending", "running", "done", "failed", "cancelled"
+
+_local = threading.local()
+
+def current_task():
+    """
+    The Task running on this worker thread, or None (e.g. on the GUI thread).
+    """
+    return getattr(_local, "task", None)
+
+def cancelled():
+    """
+    Cooperative cancellation point for long task bodies.
+    """
+    task = current_task()
+    return task is not None and task.cancel_requested
+
+class Task:
+    """
+    Handle for submitted work. cancel() drops it if still queued; a running task
+    only sees cancel_requested and decides itself where to stop.
+    """
+    __slots__ = ("name", "priority", "fn", "args", "kwargs", "on_done", "on_error",
+                 "state", "cancel_requested", "result", "error", "submitted", "started", "finished")
+
+    def __init__(self, name, priority, fn, args, kwargs, on_done, on_error):
+        self.name = name
+        self.priority = priority
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.on_done = on_done
+        self.on_error = on_error
+        self.state = PENDING
+        self.cancel_requested = False
+        self.result = None
+        self.error = None
+        self.submitted = time.perf_counter()
+        self.started = None
+        self.finished = None
+
+    @property
+    def done(self):
+        return self.state in (DONE, FAILED, CANCELLED)
+
+    def cancel(self):
+        self.cancel_requested = True
+
+    @property
+    def wait_ms(self):
+        return ((self.started or time.perf_counter()) - self.submitted) * 1000
+
+    @property
+    def run_ms(self):
+        if self.started is None: return 0.0
+        return ((self.finished or time.perf_counter()) - self.started) * 1000
+
+class TaskExecutor(QObject):
+    """
+    Small priority thread pool for heavy actions, so the frame loop never blocks on them.
+    submit() returns at once; on_done / on_error run later on the thread that owns
+    the executor (the GUI thread), delivered through a queued Qt signal.
+    Metrics: queue depth and per-task-name wait / run latency.
+    """
+    completed = Signal(object) # Task (done, failed or cancelled)
+
+    def __init__(self, workers=2, log_ms=100):
+        super().__init__()
+        self.workers = workers
+        self.log_ms = log_ms # Tasks running longer than this are logged
+        self.cond = threading.Condition()
+        self.queue = []           # Heap of (priority, seq, task)
+        self.seq = itertools.count()
+        self.running = 0
+        self.background = 0       # Running PRIORITY_PREFETCH tasks
+        self.active = set()       # Running tasks, asked to cancel on shutdown
+        self.stats = {}           # name -> [count, total wait ms, total run ms, max run ms]
+        self.stopped = False
+        self.completed.connect(self._dispatch)
+        self.threads = [threading.Thread(target=self._worker, name=f"TaskExecutor-{i}", daemon=True)
+                        for i in range(workers)]
+        for thread in self.threads:
+            thread.start()
+
+    def submit(self, fn, *args, priority=PRIORITY_NORMAL, name=None, on_done=None, on_error=None, **kwargs):
+        task = Task(name or getattr(fn, "__name__", "task"), priority, fn, args, kwargs, on_done, on_error)
+        with self.cond:
+            if self.stopped:
+                task.state = CANCELLED
+                return task
+            heapq.heappush(self.queue, (priority, next(self.seq), task))
+            self.cond.notify()
+        return task
+
+    @property
+    def depth(self):
+        """
+        Tasks waiting for a worker (cancelled ones are dropped lazily and may be counted).
+        """
+        return len(self.queue)
+
+    def _next_task(self):
+        # Called with the lock held. Prefetch work may not occupy the last idle worker
+        while self.queue:
+            priority, _, task = self.queue[0]
+            if task.cancel_requested:
+                heapq.heappop(self.queue)
+                task.state = CANCELLED
+                self.completed.emit(task)
+                continue
+            if priority >= PRIORITY_PREFETCH and self.background >= self.workers - 1 and self.workers > 1:
+                return None
+            heapq.heappop(self.queue)
+            return task
+        return None
+
+    def _worker(self):
+        while True:
+            with self.cond:
+                task = None
+                while not self.stopped:
+                    task = self._next_task()
+                    if task is not None: break
+                    self.cond.wait()
+                if task is None: return
+                self.running += 1
+                self.active.add(task)
+                if task.priority >= PRIORITY_PREFETCH: self.background += 1
+            self._run(task)
+            with self.cond:
+                self.running -= 1
+                self.active.discard(task)
+                if task.priority >= PRIORITY_PREFETCH: self.background -= 1
+                self.cond.notify_all() # A held-back prefetch task may fit now
+
+    def _run(self, task):
+        task.state = RUNNING
+        task.started = time.perf_counter()
+        _local.task = task
+        try:
+            task.result = task.fn(*task.args, **task.kwargs)
+            task.state = CANCELLED if task.cancel_requested else DONE
+        except Exception as e:
+            task.error = e
+            task.state = FAILED
+        finally:
+            _local.task = None
+            task.finished = time.perf_counter()
+        self._record(task)
+        self.completed.emit(task)
+
+    def _record(self, task):
+        with self.cond:
+            entry = self.stats.setdefault(task.name, [0, 0.0, 0.0, 0.0])
+            entry[0] += 1
+            entry[1] += task.wait_ms
+            entry[2] += task.run_ms
+            entry[3] = max(entry[3], task.run_ms)
+            depth = len(self.queue)
+        if task.state == FAILED:
+            print(f"TaskExecutor: {task.name} failed: {task.error}")
+        elif task.run_ms >= self.log_ms:
+            print(f"TaskExecutor: {task.name} {task.state} in {task.run_ms:.0f} ms "
+                  f"(waited {task.wait_ms:.0f} ms, {depth} queued)")
+
+    def _dispatch(self, task):
+        # GUI thread
+        if task.state == DONE and task.on_done:
+            task.on_done(task.result)
+        elif task.state == FAILED and task.on_error:
+            task.on_error(task.error)
+
+    def metrics(self):
+        """
+        {"depth": n, "running": n, "tasks": {name: {count, wait_ms, run_ms, max_run_ms}}} (averages).
+        """
+        with self.cond:
+            tasks = {name: {"count": c, "wait_ms": w / c, "run_ms": r / c, "max_run_ms": m}
+                     for name, (c, w, r, m) in self.stats.items()}
+            return {"depth": len(self.queue), "running": self.running, "tasks": tasks}
+
+    def shutdown(self, timeout=1.0):
+        """
+        Stops the workers. Queued tasks are dropped; running ones are asked to cancel.
+        """
+        with self.cond:
+            self.stopped = True
+            for _, _, task in self.queue:
+                task.cancel_requested = True
+                task.state = CANCELLED
+            self.queue = []
+            for task in self.active:
+                task.cancel_requested = True
+            self.cond.notify_all()
+        deadline = time.time() + timeout
+        for thread in self.threads:
+            thread.join(timeout=max(0.0, deadline - time.time()))